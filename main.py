@@ -3,12 +3,25 @@ from discord.ext import commands, tasks
 from discord import app_commands
 import json
 import os
+import sqlite3
+import gzip
+import hashlib
+import uuid
 import asyncio
 import aiofiles
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
 import re
+import struct
+import time
+import itertools
+import random
+import bisect
+import contextlib
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging FIRST
 logging.basicConfig(level=logging.INFO)
@@ -17,17 +30,6 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Try to import MCRcon with fallback
-try:
-    from mcrcon import MCRcon
-    RCON_AVAILABLE = True
-    logger.info("✅ MCRcon module successfully loaded")
-except ImportError:
-    logger.warning(
-        "⚠️ MCRcon module not available - RCON commands will be disabled")
-    RCON_AVAILABLE = False
-    MCRcon = None
-
 # Bot configuration
 TOKEN = os.getenv('DISCORD_TOKEN')
 
@@ -37,6 +39,89 @@ CONFIG_FILE = 'config.json'
 EOS_MAPPING_FILE = 'player_eos_mapping.json'
 DISCORD_MAPPING_FILE = 'discord_eos_mapping.json'
 SERVERS_FILE = 'servers.json'
+DATABASE_FILE = os.getenv('LEVELREWARDS_DB', 'levelrewards.db')
+# Changes are collected for this long and then written in one transaction
+PERSIST_FLUSH_WINDOW = float(os.getenv('PERSIST_FLUSH_WINDOW', 2.0))
+
+# Claim/delete/link events are journaled before they reach the database
+JOURNAL_FILE = 'claims.journal'
+JOURNAL_COMMIT_DELAY = 0.02  # seconds to gather appends into one fsync
+JOURNAL_COMPACT_THRESHOLD = 500  # entries before an early compaction
+
+# Claim outbox - undelivered reward commands are retried in the background
+CLAIM_RETRY_TICK = 15  # seconds between outbox checks
+CLAIM_RETRY_BASE_DELAY = 30  # seconds, doubled per failed attempt
+CLAIM_RETRY_MAX_DELAY = 1800
+CLAIM_RETRY_MAX_ATTEMPTS = 12  # then the claim waits for an admin (/claimqueue)
+
+# Autosave snapshots - newest snapshot per bucket is kept
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_KEEP_HOURLY = 24
+SNAPSHOT_KEEP_DAILY = 7
+SNAPSHOT_KEEP_WEEKLY = 8
+
+# Dedicated thread pools (tune to the host's core count via env)
+CPU_COUNT = os.cpu_count() or 1
+RCON_EXECUTOR_WORKERS = int(
+    os.getenv('RCON_EXECUTOR_WORKERS', min(4, CPU_COUNT + 1)))
+DISK_EXECUTOR_WORKERS = int(
+    os.getenv('DISK_EXECUTOR_WORKERS', min(4, CPU_COUNT)))
+
+# RCON connection pool settings
+RCON_POOL_SIZE = int(os.getenv('RCON_POOL_SIZE', 2))
+RCON_POOL_IDLE_TIMEOUT = 300  # seconds before an idle session is dropped
+
+# Source RCON protocol
+RCON_PACKET_RESPONSE_VALUE = 0
+RCON_PACKET_EXECCOMMAND = 2
+RCON_PACKET_AUTH_RESPONSE = 2
+RCON_PACKET_AUTH = 3
+RCON_MAX_BODY_SIZE = 4086  # bodies this large may continue in a next packet
+RCON_CONTINUATION_GRACE = 0.25  # seconds to wait for a continuation packet
+RCON_SENTINEL_GRACE = 0.5  # seconds after the last packet to wait for the sentinel
+RCON_MAX_PACKET_LENGTH = 1024 * 1024
+
+# RCON scheduling - lower value runs first
+RCON_PRIORITY_INTERACTIVE = 0  # player-facing commands (/claim, /ark)
+RCON_PRIORITY_ADMIN = 1  # admin commands and status probes
+RCON_PRIORITY_BACKGROUND = 2  # automatic player scans
+RCON_PRIORITY_NAMES = {
+    RCON_PRIORITY_INTERACTIVE: "interactive",
+    RCON_PRIORITY_ADMIN: "admin",
+    RCON_PRIORITY_BACKGROUND: "background"
+}
+RCON_DEFAULT_RATE_LIMIT = 5.0  # commands per second, override per server with 'rcon_rate_limit'
+
+# Circuit breaker + retry policy ('retry_attempts' / 'connection_timeout' in servers.json)
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures before a server is cut off
+CIRCUIT_RESET_TIMEOUT = 60  # seconds before a half-open probe is allowed
+RCON_RETRY_BASE_DELAY = 0.5  # seconds, doubled per retry
+RCON_RETRY_MAX_DELAY = 5.0
+
+# Commands without side effects - safe to replay after a timeout
+# (getchat/getgamelog are not - they drain the server's buffer)
+RCON_READ_ONLY_COMMANDS = ("listplayers", "version")
+
+# Identical concurrent read-only commands share one request, results stay fresh this long
+RCON_READ_CACHE_TTL = 2.0  # seconds
+
+# /serverstatus probes all servers in parallel within this overall deadline
+SERVER_STATUS_DEADLINE = 10  # seconds
+
+# ListPlayers line: "0. PlayerName, 0002a1b2c3..."
+PLAYER_LINE_PATTERN = re.compile(r'(\d+)\.\s+([^,]+),\s+(\w+)')
+
+# Player scans run in parallel across servers
+PLAYER_SCAN_CONCURRENCY = int(os.getenv('PLAYER_SCAN_CONCURRENCY', 4))
+PLAYER_SCAN_SERVER_TIMEOUT = 5.0  # seconds per server
+PLAYER_SCAN_DEADLINE = 20.0  # seconds for the whole scan
+
+# Adaptive player scan intervals (seconds)
+PLAYER_SCAN_TICK = 15
+PLAYER_SCAN_INTERVAL_POPULATED = 60
+PLAYER_SCAN_INTERVAL_EMPTY = 180
+PLAYER_SCAN_INTERVAL_UNREACHABLE = 120
+PLAYER_SCAN_INTERVAL_MAX = 900
 
 # HyperBeast Blueprint Categories mit korrekten ARK Blueprint-Pfaden
 HB_CATEGORIES = {
@@ -396,6 +481,1812 @@ HB_CATEGORIES = {
     }
 }
 
+# =============================================================================
+# EXECUTORS
+# =============================================================================
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """Named thread pool that reports queue depth and saturation"""
+
+    def __init__(self, name, max_workers):
+        super().__init__(max_workers=max(1, max_workers),
+                         thread_name_prefix=name)
+        self.name = name
+        self.submitted = 0
+        self.active = 0
+        self.completed = 0
+        self.peak_queued = 0
+        self._metrics_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._metrics_lock:
+            self.submitted += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        def run():
+            with self._metrics_lock:
+                self.active += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._metrics_lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        return super().submit(run)
+
+    @property
+    def queued(self):
+        return max(0, self.submitted - self.completed - self.active)
+
+    @property
+    def saturation(self):
+        return self.active / self._max_workers
+
+    def metrics(self):
+        with self._metrics_lock:
+            return {
+                "workers": self._max_workers,
+                "active": self.active,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "saturation": self.saturation
+            }
+
+
+# =============================================================================
+# RCON CLIENT & CONNECTION POOL
+# =============================================================================
+
+
+class RconError(Exception):
+    """Raised when an RCON session fails"""
+
+
+class RconConnectError(RconError):
+    """Raised when no RCON session could be opened - nothing was sent"""
+
+
+def is_read_only_rcon_command(command):
+    """True for commands that only read server state"""
+    return command.strip().lower().startswith(RCON_READ_ONLY_COMMANDS)
+
+
+class _RconResponse:
+    """Collects the packets belonging to one RCON request id"""
+
+    def __init__(self, loop, is_auth=False, stream=False):
+        self.future = loop.create_future()
+        self.chunks = []
+        self.packets = 0
+        self.is_auth = is_auth
+        self.grace_handle = None
+        self.sentinel_id = None
+        # Streaming responses hand out complete lines instead of one string
+        self.lines = asyncio.Queue() if stream else None
+        self._partial = ""
+
+    def add_chunk(self, text):
+        self.packets += 1
+        if self.lines is None:
+            self.chunks.append(text)
+            return
+
+        self._partial += text
+        *complete, self._partial = self._partial.split('\n')
+        for line in complete:
+            self.lines.put_nowait(line)
+
+    def finish(self):
+        self._cancel_grace()
+        if self.future.done():
+            return
+        self.future.set_result("".join(self.chunks))
+        if self.lines is not None:
+            if self._partial:
+                self.lines.put_nowait(self._partial)
+                self._partial = ""
+            self.lines.put_nowait(None)
+
+    def fail(self, error):
+        self._cancel_grace()
+        if self.future.done():
+            return
+        self.future.set_exception(error)
+        if self.lines is not None:
+            self.lines.put_nowait(None)
+
+    def cancel(self):
+        self._cancel_grace()
+        self.future.cancel()
+
+    def _cancel_grace(self):
+        if self.grace_handle:
+            self.grace_handle.cancel()
+            self.grace_handle = None
+
+
+class AsyncRconClient:
+    """asyncio-native Source RCON client (used by ARK: Survival Ascended)"""
+
+    def __init__(self,
+                 host,
+                 port,
+                 password,
+                 timeout=10,
+                 executor=None,
+                 sentinel=True):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.executor = executor  # for DNS lookups, default executor if None
+        # End-of-response marker, switched off if the server never mirrors it
+        self.sentinel = sentinel
+        self.closed = True
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}  # request id -> _RconResponse
+        self._sentinels = {}  # sentinel id -> _RconResponse
+        self._next_id = 0
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            self._open_connection(), timeout=self.timeout)
+        self.closed = False
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+        try:
+            await self._request(RCON_PACKET_AUTH, self.password, is_auth=True)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _open_connection(self):
+        host = self.host
+        if self.executor is not None:
+            # Resolve on our own pool - asyncio would use the default executor
+            infos = await asyncio.get_running_loop().run_in_executor(
+                self.executor, socket.getaddrinfo, self.host, self.port, 0,
+                socket.SOCK_STREAM)
+            host = infos[0][4][0]
+        return await asyncio.open_connection(host, self.port)
+
+    async def command(self, command, acks=None):
+        """Execute a command and return the reassembled response
+
+        acks (a one-item list) receives the response as soon as it is complete,
+        so a caller that gives up later still knows the command was executed.
+        """
+        return await self._request(RCON_PACKET_EXECCOMMAND,
+                                   command,
+                                   acks=acks)
+
+    async def command_lines(self, command):
+        """Execute a command and yield response lines as packets arrive"""
+        if self.closed:
+            raise RconError("Not connected")
+
+        response = _RconResponse(asyncio.get_running_loop(), stream=True)
+        request_id = self._send_request(response, RCON_PACKET_EXECCOMMAND,
+                                        command)
+        try:
+            await self._writer.drain()
+            while True:
+                try:
+                    line = await asyncio.wait_for(response.lines.get(),
+                                                  timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    if not self._finish_without_sentinel(response):
+                        raise
+                    continue
+                if line is None:
+                    break
+                yield line
+
+            # Surface a session that died mid-response
+            response.future.result()
+        finally:
+            self._forget(request_id, response)
+
+    async def command_many(self, commands, acks=None):
+        """Pipeline several commands, returns a response or exception per command
+
+        acks (a list as long as commands) is filled with each response the
+        moment it completes.
+        """
+        if self.closed:
+            raise RconError("Not connected")
+
+        loop = asyncio.get_running_loop()
+        requests = []
+        try:
+            # Write every packet first, then wait for all answers at once
+            for index, command in enumerate(commands):
+                response = _RconResponse(loop)
+                self._track_ack(response, acks, index)
+                request_id = self._send_request(response,
+                                                RCON_PACKET_EXECCOMMAND,
+                                                command)
+                requests.append((request_id, response))
+            await self._writer.drain()
+            await asyncio.wait([response.future for _, response in requests],
+                               timeout=self.timeout)
+
+            results = []
+            for _, response in requests:
+                future = response.future
+                if not future.done() and not self._finish_without_sentinel(
+                        response):
+                    results.append(asyncio.TimeoutError())
+                elif future.exception() is not None:
+                    results.append(future.exception())
+                else:
+                    results.append(future.result())
+            return results
+        finally:
+            for request_id, response in requests:
+                self._forget(request_id, response)
+
+    async def close(self):
+        if self.closed and self._writer is None:
+            return
+        self.closed = True
+
+        if self._reader_task and not self._reader_task.done():
+            self._reader_task.cancel()
+        self._fail_pending(RconError("Connection closed"))
+
+        if self._writer is not None:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = None
+
+    async def _request(self, packet_type, body, is_auth=False, acks=None):
+        if self.closed:
+            raise RconError("Not connected")
+
+        response = _RconResponse(asyncio.get_running_loop(), is_auth=is_auth)
+        self._track_ack(response, acks, 0)
+        request_id = self._send_request(response, packet_type, body)
+
+        try:
+            await self._writer.drain()
+            await asyncio.wait([response.future], timeout=self.timeout)
+            if not response.future.done(
+            ) and not self._finish_without_sentinel(response):
+                raise asyncio.TimeoutError()
+            return response.future.result()
+        finally:
+            self._forget(request_id, response)
+
+    def _send_request(self, response, packet_type, body):
+        """Register a response and write its packet, followed by the sentinel"""
+        request_id = self._new_request_id()
+        self._pending[request_id] = response
+        self._send_packet(request_id, packet_type, body)
+
+        if self.sentinel and not response.is_auth:
+            # Requests are answered in order - once this empty packet is
+            # mirrored back, every packet of the command has arrived
+            response.sentinel_id = self._new_request_id()
+            self._sentinels[response.sentinel_id] = response
+            self._send_packet(response.sentinel_id,
+                              RCON_PACKET_RESPONSE_VALUE, "")
+        return request_id
+
+    @staticmethod
+    def _track_ack(response, acks, index):
+        if acks is None:
+            return
+
+        def record(future):
+            if not future.cancelled() and future.exception() is None:
+                acks[index] = future.result()
+
+        response.future.add_done_callback(record)
+
+    def _forget(self, request_id, response):
+        self._pending.pop(request_id, None)
+        if response.sentinel_id is not None:
+            self._sentinels.pop(response.sentinel_id, None)
+        response.cancel()
+
+    def _finish_without_sentinel(self, response):
+        """Complete a response whose sentinel never came back"""
+        if response.sentinel_id is None or response.packets == 0:
+            return False
+
+        if self.sentinel:
+            logger.debug(
+                f"RCON server {self.host}:{self.port} does not mirror sentinels - using packet size heuristic"
+            )
+            self.sentinel = False
+        response.finish()
+        return True
+
+    def _new_request_id(self):
+        # Ids stay positive - the server answers a failed login with -1
+        self._next_id = self._next_id % 0x7FFFFFFF + 1
+        return self._next_id
+
+    def _send_packet(self, request_id, packet_type, body):
+        payload = struct.pack('<ii', request_id, packet_type) + body.encode(
+            'utf-8') + b'\x00\x00'
+        self._writer.write(struct.pack('<i', len(payload)) + payload)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(4)
+                (length, ) = struct.unpack('<i', header)
+                if length < 10 or length > RCON_MAX_PACKET_LENGTH:
+                    raise RconError(f"Invalid packet length {length}")
+
+                payload = await self._reader.readexactly(length)
+                request_id, packet_type = struct.unpack('<ii', payload[:8])
+                self._dispatch(request_id, packet_type,
+                               payload[8:].rstrip(b'\x00'))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.closed = True
+            self._fail_pending(
+                e if isinstance(e, RconError) else RconError(str(e)))
+
+    def _dispatch(self, request_id, packet_type, body):
+        if request_id == -1:
+            # Login rejected
+            for response in self._pending.values():
+                if response.is_auth:
+                    response.fail(RconError("Login failed"))
+            return
+
+        sentinel_response = self._sentinels.pop(request_id, None)
+        if sentinel_response is not None:
+            # Mirrored sentinel - the command's response is complete
+            sentinel_response.finish()
+            return
+
+        response = self._pending.get(request_id)
+        if response is None:
+            # Late packet of a request that already timed out, or the
+            # trailing packet of a mirrored sentinel
+            return
+
+        if response.is_auth:
+            if packet_type == RCON_PACKET_AUTH_RESPONSE:
+                response.finish()
+            return
+
+        response.add_chunk(body.decode('utf-8', errors='replace'))
+        response._cancel_grace()
+        if response.sentinel_id is not None:
+            # The sentinel follows the last packet right away - if it does
+            # not, the server does not mirror it
+            response.grace_handle = asyncio.get_running_loop().call_later(
+                RCON_SENTINEL_GRACE, self._finish_without_sentinel, response)
+            return
+
+        # No sentinel - guess the end from the packet size
+        if len(body) >= RCON_MAX_BODY_SIZE:
+            # Full packet - the response may continue in the next one
+            response.grace_handle = asyncio.get_running_loop().call_later(
+                RCON_CONTINUATION_GRACE, response.finish)
+        else:
+            response.finish()
+
+    def _fail_pending(self, error):
+        for response in list(self._pending.values()):
+            response.fail(error)
+
+    def awaiting_sentinel(self):
+        """True if a response got packets but its sentinel is still missing"""
+        return any(response.packets and not response.future.done()
+                   for response in self._sentinels.values())
+
+
+class RconConnectionPool:
+    """Keeps authenticated RCON sessions alive per ARK server"""
+
+    def __init__(self,
+                 max_idle=RCON_POOL_SIZE,
+                 idle_timeout=RCON_POOL_IDLE_TIMEOUT,
+                 executor=None):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.executor = executor
+        self._idle = {}  # server_id -> [(signature, client, last_used)]
+        self._no_sentinel = set()  # servers that never mirror the sentinel
+
+    @staticmethod
+    def _signature(server):
+        # Sessions are only reusable while host, port and password match
+        return (server['host'], int(server['port']), server['password'])
+
+    async def acquire(self, server_id, server, timeout, fresh=False):
+        """Borrow a session, returns (client, reused)"""
+        signature = self._signature(server)
+
+        if not fresh:
+            now = time.monotonic()
+            idle = self._idle.get(server_id, [])
+            while idle:
+                client_signature, client, last_used = idle.pop()
+                if (client_signature == signature and not client.closed
+                        and now - last_used < self.idle_timeout):
+                    client.timeout = timeout
+                    return client, True
+                await client.close()
+
+        client = AsyncRconClient(server['host'],
+                                 int(server['port']),
+                                 server['password'],
+                                 timeout=timeout,
+                                 executor=self.executor,
+                                 sentinel=server.get('rcon_sentinel', True)
+                                 and server_id not in self._no_sentinel)
+        await client.connect()
+        return client, False
+
+    async def release(self, server_id, server, client):
+        """Return a healthy session to the pool"""
+        if not client.sentinel:
+            self._no_sentinel.add(server_id)
+
+        idle = self._idle.setdefault(server_id, [])
+        if not client.closed and len(idle) < self.max_idle:
+            idle.append((self._signature(server), client, time.monotonic()))
+            return
+        await client.close()
+
+    async def discard(self, server_id, client):
+        """Drop a broken session"""
+        # Abandoned while still waiting for a sentinel - do not use it again
+        if not client.sentinel or client.awaiting_sentinel():
+            self._no_sentinel.add(server_id)
+        await client.close()
+
+    async def close_server(self, server_id):
+        for _, client, _ in self._idle.pop(server_id, []):
+            await client.close()
+
+    async def close_all(self):
+        for server_id in list(self._idle.keys()):
+            await self.close_server(server_id)
+        self._no_sentinel.clear()
+
+    def idle_count(self, server_id):
+        return len(self._idle.get(server_id, []))
+
+
+class RconScheduler:
+    """Per-server RCON queue with priority classes and a commands-per-second budget"""
+
+    def __init__(self, server_id, rate_limit=RCON_DEFAULT_RATE_LIMIT,
+                 workers=RCON_POOL_SIZE):
+        self.server_id = server_id
+        self.rate_limit = rate_limit
+        self.worker_count = max(1, workers)
+        self.in_flight = 0
+        self.completed = 0
+        self._queue = None
+        self._queued = {priority: 0 for priority in RCON_PRIORITY_NAMES}
+        self._sequence = itertools.count()  # FIFO within one priority
+        self._tokens = max(1.0, rate_limit)
+        self._last_refill = time.monotonic()
+        self._workers = []
+
+    async def submit(self, job, priority=RCON_PRIORITY_ADMIN, cost=1):
+        """Queue job (a coroutine factory) and wait for its result"""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(self.worker_count)
+            ]
+
+        future = asyncio.get_running_loop().create_future()
+        self._queued[priority] = self._queued.get(priority, 0) + 1
+        self._queue.put_nowait(
+            (priority, next(self._sequence), cost, job, future))
+        return await future
+
+    def queue_depth(self):
+        """Waiting jobs per priority class"""
+        return {
+            RCON_PRIORITY_NAMES.get(priority, str(priority)): count
+            for priority, count in self._queued.items()
+        }
+
+    def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+    def _reserve(self, cost):
+        """Take tokens for a job, returns seconds to wait if the budget is spent"""
+        if self.rate_limit <= 0:
+            return 0
+
+        now = time.monotonic()
+        capacity = max(1.0, self.rate_limit)
+        self._tokens = min(
+            capacity,
+            self._tokens + (now - self._last_refill) * self.rate_limit)
+        self._last_refill = now
+
+        # Batches larger than the burst capacity may run into debt
+        needed = min(cost, capacity)
+        if self._tokens >= needed:
+            self._tokens -= cost
+            return 0
+        return (needed - self._tokens) / self.rate_limit
+
+    async def _worker(self):
+        while True:
+            item = await self._queue.get()
+            priority, _, cost, job, future = item
+            if future.cancelled():
+                self._queued[priority] -= 1
+                continue
+
+            wait = self._reserve(cost)
+            if wait > 0:
+                # Re-queue so a more urgent job can take the next slot
+                self._queue.put_nowait(item)
+                await asyncio.sleep(wait)
+                continue
+
+            self._queued[priority] -= 1
+            self.in_flight += 1
+            task = asyncio.ensure_future(job())
+            future.add_done_callback(
+                lambda f, task=task: task.cancel() if f.cancelled() else None)
+            try:
+                await asyncio.wait([task])
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+            if future.done():
+                if not task.cancelled():
+                    task.exception()  # already handled by the caller
+            elif task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one ARK server"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self,
+                 failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout=CIRCUIT_RESET_TIMEOUT,
+                 start_half_open=False):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.HALF_OPEN if start_half_open else self.CLOSED
+        self.opened_at = None
+        self._probe_started = None
+
+    def allow(self):
+        """Whether a call may go through right now"""
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_started = None
+
+        # Half-open: let a single probe through; a lost probe expires
+        if (self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout):
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if (self.state == self.HALF_OPEN
+                or self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+    def retry_in(self):
+        """Seconds until an open breaker allows a probe"""
+        if self.state != self.OPEN:
+            return 0
+        return max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class SingleFlight:
+    """Shares one in-flight call and its fresh result between identical requests"""
+
+    def __init__(self, ttl=RCON_READ_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.shared = 0
+        self._in_flight = {}  # key -> task
+        self._cache = {}  # key -> (expires_at, result)
+
+    async def do(self, key, factory):
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self.hits += 1
+                return cached[1]
+            del self._cache[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(
+                lambda done, key=key: self._finish(key, done))
+        else:
+            self.shared += 1
+
+        # One impatient caller must not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def invalidate(self):
+        """Forget all cached results"""
+        self._cache.clear()
+
+    def _finish(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result() is not None and self.ttl > 0:
+            self._cache[key] = (time.monotonic() + self.ttl, task.result())
+
+
+# =============================================================================
+# REWARD PLANS
+# =============================================================================
+
+
+class RewardConfigError(ValueError):
+    """A reward command in config.json that cannot be compiled"""
+
+
+class RewardStep:
+    """One compiled reward command - a claim only fills in the player"""
+
+    ITEM = 'item'  # GiveItemNum <id> <amount> <quality>
+    BLUEPRINT = 'blueprint'  # GiveItem "Blueprint'...'" <amount> <quality> <bp>
+    COMMAND = 'command'  # anything else, sent as is with {player} filled in
+
+    def __init__(self,
+                 kind,
+                 template,
+                 source,
+                 item=None,
+                 amount=None,
+                 quality=None):
+        self.kind = kind
+        self.template = template
+        self.source = source
+        self.item = item
+        self.amount = amount
+        self.quality = quality
+
+    def render(self, player_name, eos_id):
+        return self.template.replace('{eos_id}',
+                                     eos_id).replace('{player}', player_name)
+
+    @staticmethod
+    def _number(value, what, source):
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise RewardConfigError(f"{what} '{value}' is not a number: {source}")
+        if number < 0:
+            raise RewardConfigError(f"{what} '{value}' is negative: {source}")
+        return number
+
+    @classmethod
+    def compile(cls, reward):
+        if not isinstance(reward, dict) or not isinstance(
+                reward.get('cmd'), str) or not reward['cmd'].strip():
+            raise RewardConfigError(f"entry without 'cmd': {reward!r}")
+
+        source = reward['cmd'].strip()
+        parts = source.split()
+
+        if parts[0] == 'GiveItemNum':
+            if len(parts) < 3:
+                raise RewardConfigError(
+                    f"GiveItemNum needs an item id and amount: {source}")
+            item = cls._number(parts[1], "item id", source)
+            amount = cls._number(parts[2], "amount", source)
+            quality = cls._number(parts[3] if len(parts) > 3 else 0,
+                                  "quality", source)
+            return cls(
+                cls.ITEM,
+                f'GiveItemToEOSID {{eos_id}} {item} {amount} {quality} 0 0 0 0 0 0',
+                source, item, amount, quality)
+
+        if parts[0] == 'GiveItem':
+            blueprint_match = re.search(r'"Blueprint\'([^\']+)\'"', source)
+            if not blueprint_match:
+                raise RewardConfigError(
+                    f"GiveItem without a Blueprint path: {source}")
+            blueprint_path = blueprint_match.group(1)
+            amount = cls._number(parts[-3] if len(parts) >= 4 else 1,
+                                 "amount", source)
+            quality = cls._number(parts[-2] if len(parts) >= 4 else 0,
+                                  "quality", source)
+            return cls(
+                cls.BLUEPRINT,
+                f'GiveItemToEOSID {{eos_id}} "Blueprint\'{blueprint_path}\'" {amount} {quality} 0 0 0 0 0 0',
+                source, blueprint_path, amount, quality)
+
+        return cls(cls.COMMAND, source, source)
+
+
+class RewardPlan:
+    """All compiled commands of one reward level"""
+
+    def __init__(self, level, steps):
+        self.level = level
+        self.steps = steps
+
+    def render(self, player_name, eos_id):
+        return [step.render(player_name, eos_id) for step in self.steps]
+
+    def __len__(self):
+        return len(self.steps)
+
+
+class KeyedLock:
+    """One asyncio.Lock per key, dropped again once nobody holds or waits for it"""
+
+    def __init__(self):
+        self._locks = {}  # key -> [lock, holders + waiters]
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            # An uncontended acquire does not yield to the loop
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+
+class ClaimTransaction:
+    """A claim in the outbox - its rendered commands are delivered step by step"""
+
+    def __init__(self,
+                 claim_id,
+                 player_name,
+                 level,
+                 commands,
+                 delivered=(),
+                 attempts=0,
+                 next_attempt=0.0,
+                 created_at=None,
+                 last_error=None):
+        self.claim_id = claim_id
+        self.player_name = player_name
+        self.level = level
+        self.commands = list(commands)
+        self.delivered = set(delivered)  # indexes of commands known to be delivered
+        self.attempts = attempts
+        self.next_attempt = next_attempt  # epoch seconds
+        self.created_at = created_at or datetime.now().isoformat()
+        self.last_error = last_error
+
+    @property
+    def pending_steps(self):
+        return [
+            step for step in range(len(self.commands))
+            if step not in self.delivered
+        ]
+
+    @property
+    def complete(self):
+        return len(self.delivered) >= len(self.commands)
+
+    @property
+    def given_up(self):
+        return self.attempts >= CLAIM_RETRY_MAX_ATTEMPTS
+
+    def hold_off(self):
+        """Keep the retry worker away while a delivery is in flight"""
+        self.next_attempt = time.time() + CLAIM_RETRY_BASE_DELAY
+
+    def schedule_retry(self, error):
+        self.attempts += 1
+        self.last_error = error
+        delay = CLAIM_RETRY_BASE_DELAY * 2**(self.attempts - 1)
+        self.next_attempt = time.time() + min(
+            delay * random.uniform(0.8, 1.2), CLAIM_RETRY_MAX_DELAY)
+
+    def to_row(self):
+        return (self.claim_id, self.player_name, self.level,
+                json.dumps(self.commands), json.dumps(sorted(self.delivered)),
+                self.attempts, self.next_attempt, self.created_at,
+                self.last_error)
+
+    @classmethod
+    def from_row(cls, row):
+        (claim_id, player_name, level, commands, delivered, attempts,
+         next_attempt, created_at, last_error) = row
+        return cls(claim_id, player_name, level, json.loads(commands),
+                   json.loads(delivered), attempts, next_attempt, created_at,
+                   last_error)
+
+
+class LevelOrdinals:
+    """Append-only level -> bit mapping shared by all LevelBitsets"""
+
+    def __init__(self):
+        self._bits = {}  # level -> bit
+        self._ascending = []  # (level, bit) sorted by level
+
+    def bit(self, level):
+        """Bit of a level, registering unknown levels"""
+        bit = self._bits.get(level)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[level] = bit
+            bisect.insort(self._ascending, (level, bit))
+        return bit
+
+    def known_bit(self, level):
+        """Bit of a level, 0 if it was never registered"""
+        return self._bits.get(level, 0)
+
+    def register(self, levels):
+        # Configured levels get the low bits so typical bitsets stay small
+        for level in sorted(levels):
+            self.bit(level)
+
+    def mask(self, levels):
+        mask = 0
+        for level in levels:
+            mask |= self.bit(int(level))
+        return mask
+
+    def levels(self, bits):
+        """Levels set in bits, ascending"""
+        return [level for level, bit in self._ascending if bits & bit]
+
+
+LEVEL_ORDINALS = LevelOrdinals()
+
+
+class LevelBitset(int):
+    """Claimed levels as bits over LEVEL_ORDINALS - immutable like int, stored as a list in JSON"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_levels(cls, levels):
+        return cls(LEVEL_ORDINALS.mask(levels))
+
+    def to_list(self):
+        return LEVEL_ORDINALS.levels(self)
+
+    def with_level(self, level):
+        return LevelBitset(self | LEVEL_ORDINALS.bit(level))
+
+    def without_level(self, level):
+        return LevelBitset(self & ~LEVEL_ORDINALS.known_bit(level))
+
+    def missing(self, mask):
+        """Levels in mask that are not claimed, ascending"""
+        return LEVEL_ORDINALS.levels(mask & ~self)
+
+    def __contains__(self, level):
+        return bool(self & LEVEL_ORDINALS.known_bit(level))
+
+    def __len__(self):
+        return self.bit_count()
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __repr__(self):
+        return f"LevelBitset({self.to_list()})"
+
+
+def compile_reward_plans(levels):
+    """Compile config['levels'] into {level: RewardPlan}, returns (plans, errors)"""
+    plans = {}
+    errors = []
+    if not isinstance(levels, dict):
+        return plans, [f"'levels' must be an object, got {type(levels).__name__}"]
+
+    for level_key, rewards in levels.items():
+        try:
+            if not str(level_key).isdigit():
+                raise RewardConfigError("level is not a number")
+            level = int(level_key)
+            if not isinstance(rewards, list) or not rewards:
+                raise RewardConfigError("needs a non-empty list of rewards")
+            steps = [RewardStep.compile(reward) for reward in rewards]
+        except RewardConfigError as e:
+            # A level is delivered completely or not at all
+            errors.append(f"Level {level_key}: {e}")
+            continue
+        plans[level] = RewardPlan(level, steps)
+
+    return dict(sorted(plans.items())), errors
+
+
+# =============================================================================
+# STORAGE
+# =============================================================================
+
+
+class SqliteStore:
+    """SQLite (WAL) storage for players, claims, Discord links and servers - call from the disk executor"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS players (
+            name TEXT PRIMARY KEY,
+            eos_id TEXT
+        );
+        CREATE TABLE IF NOT EXISTS claims (
+            player_name TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            claimed_at TEXT,
+            PRIMARY KEY (player_name, level)
+        );
+        CREATE TABLE IF NOT EXISTS links (
+            discord_id TEXT PRIMARY KEY,
+            player_name TEXT NOT NULL,
+            eos_id TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS servers (
+            server_id TEXT PRIMARY KEY,
+            config TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS claim_outbox (
+            claim_id TEXT PRIMARY KEY,
+            player_name TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            commands TEXT NOT NULL,
+            delivered TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL DEFAULT 0,
+            created_at TEXT,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS links_player ON links (player_name);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        # The disk executor has several threads - one statement at a time
+        self._lock = threading.Lock()
+
+    def open(self):
+        with self._lock:
+            if self._conn is not None:
+                return
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?",
+                                     (key, )).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value))
+
+    def is_migrated(self):
+        return self.get_meta('json_migrated') is not None
+
+    def import_json(self, rewards_data, eos_mapping, discord_mapping):
+        """One-time migration of the legacy JSON files"""
+        players = {name: None for name in rewards_data}
+        players.update(eos_mapping)
+        claims = [(name, int(level), None)
+                  for name, levels in rewards_data.items()
+                  for level in levels]
+        links = [(discord_id, link.get('player_name', ''),
+                  link.get('eos_id'), json.dumps(link))
+                 for discord_id, link in discord_mapping.items()]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO players (name, eos_id) VALUES (?, ?)",
+                players.items())
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO claims (player_name, level, claimed_at) VALUES (?, ?, ?)",
+                claims)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO links (discord_id, player_name, eos_id, data) VALUES (?, ?, ?, ?)",
+                links)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(), ))
+
+    def load_players(self):
+        """(rewards_data, eos_mapping, discord_mapping) as the bot keeps them in memory"""
+        with self._lock:
+            players = self._conn.execute(
+                "SELECT name, eos_id FROM players ORDER BY rowid").fetchall()
+            claims = self._conn.execute(
+                "SELECT player_name, level FROM claims ORDER BY rowid"
+            ).fetchall()
+            links = self._conn.execute(
+                "SELECT discord_id, data FROM links ORDER BY rowid").fetchall()
+
+        rewards_data = {name: [] for name, _ in players}
+        eos_mapping = {name: eos_id for name, eos_id in players if eos_id}
+        for player_name, level in claims:
+            rewards_data.setdefault(player_name, []).append(level)
+        discord_mapping = {
+            discord_id: json.loads(data)
+            for discord_id, data in links
+        }
+        return rewards_data, eos_mapping, discord_mapping
+
+    def apply_changes(self, rows):
+        """Write one batch of changed rows in a single transaction"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO players (name, eos_id) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET eos_id = COALESCE(excluded.eos_id, eos_id)",
+                rows.get('players', ()))
+            for player_name, level, claimed_at in rows.get('claims', ()):
+                if claimed_at is None:
+                    self._conn.execute(
+                        "DELETE FROM claims WHERE player_name = ? AND level = ?",
+                        (player_name, level))
+                else:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO claims (player_name, level, claimed_at) VALUES (?, ?, ?)",
+                        (player_name, level, claimed_at))
+            for discord_id, player_name, eos_id, data in rows.get(
+                    'links', ()):
+                if data is None:
+                    self._conn.execute(
+                        "DELETE FROM links WHERE discord_id = ?",
+                        (discord_id, ))
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO links (discord_id, player_name, eos_id, data) VALUES (?, ?, ?, ?)",
+                        (discord_id, player_name, eos_id, data))
+            for claim_id, row in rows.get('outbox', ()):
+                if row is None:
+                    self._conn.execute(
+                        "DELETE FROM claim_outbox WHERE claim_id = ?",
+                        (claim_id, ))
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO claim_outbox VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row)
+            if rows.get('servers') is not None:
+                self._replace_servers(rows['servers'])
+            self._conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                rows.get('meta', ()))
+
+    def load_outbox(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT claim_id, player_name, level, commands, delivered, attempts, "
+                "next_attempt, created_at, last_error FROM claim_outbox ORDER BY rowid"
+            ).fetchall()
+        return [ClaimTransaction.from_row(row) for row in rows]
+
+    def load_servers(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT server_id, config FROM servers").fetchall()
+        return {server_id: json.loads(config) for server_id, config in rows}
+
+    def sync_servers(self, servers):
+        """Make the servers table match the given server configs"""
+        rows = [(server_id, json.dumps(config))
+                for server_id, config in servers.items()]
+        with self._lock, self._conn:
+            self._replace_servers(rows)
+
+    def _replace_servers(self, rows):
+        self._conn.execute(
+            f"DELETE FROM servers WHERE server_id NOT IN ({','.join('?' * len(rows))})",
+            [server_id for server_id, _ in rows])
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO servers (server_id, config) VALUES (?, ?)",
+            rows)
+
+
+class ClaimJournal:
+    """Append-only JSON-lines journal of claim/delete/link events with batched fsync"""
+
+    def __init__(self, path, executor, commit_delay=JOURNAL_COMMIT_DELAY):
+        self.path = path
+        self.executor = executor
+        self.commit_delay = commit_delay
+        self.last_seq = 0
+        self.size = 0  # entries in the file
+        self._buffer = []  # encoded entries not yet on disk
+        self._commit_task = None
+        self._file_lock = threading.Lock()
+
+    def read(self, folded_seq=0):
+        """Entries on disk (blocking) - a torn last line from a crash is ignored"""
+        entries = []
+        with self._file_lock:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            logger.warning(
+                                f"⚠️ Ignoring damaged journal entry after seq {entries[-1]['seq'] if entries else 0}"
+                            )
+                            break
+        self.size = len(entries)
+        self.last_seq = max([self.last_seq, folded_seq] +
+                            [entry['seq'] for entry in entries])
+        return entries
+
+    def append(self, event):
+        """Queue one event, returns its sequence number"""
+        self.last_seq += 1
+        event = dict(event, seq=self.last_seq, at=datetime.now().isoformat())
+        self._buffer.append(json.dumps(event))
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_loop())
+        return self.last_seq
+
+    async def commit(self):
+        """Wait until everything appended so far is on disk"""
+        if self._commit_task is not None and not self._commit_task.done():
+            await asyncio.shield(self._commit_task)
+
+    async def _commit_loop(self):
+        loop = asyncio.get_running_loop()
+        while self._buffer:
+            # Let concurrent appends join this fsync
+            await asyncio.sleep(self.commit_delay)
+            batch, self._buffer = self._buffer, []
+            try:
+                await loop.run_in_executor(self.executor, self._write, batch)
+            except Exception:
+                self._buffer = batch + self._buffer
+                raise
+            self.size += len(batch)
+
+    def _write(self, lines):
+        with self._file_lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self, folded_seq):
+        """Drop entries the database already contains (blocking), returns the entries left"""
+        with self._file_lock:
+            if not os.path.exists(self.path):
+                return 0
+            with open(self.path, 'r', encoding='utf-8') as f:
+                keep = []
+                for line in f:
+                    try:
+                        if json.loads(line)['seq'] > folded_seq:
+                            keep.append(line)
+                    except ValueError:
+                        break
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(keep)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        self.size = len(keep)
+        return self.size
+
+
+class SnapshotManager:
+    """Deduplicated, gzip-compressed autosave snapshots with bucketed retention - call from the disk executor"""
+
+    RETENTION = (('%Y%m%d%H', SNAPSHOT_KEEP_HOURLY),
+                 ('%Y%m%d', SNAPSHOT_KEEP_DAILY), ('%G%V',
+                                                   SNAPSHOT_KEEP_WEEKLY))
+
+    LEGACY_SUFFIX = '.legacy.json.gz'  # adopted autosave_*.json files
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+        self._entries = None  # [{'file', 'created', 'hash', 'bytes'}], oldest first
+        self._adopted = set()  # legacy file names already copied in
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(body):
+        return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+    def write(self, created, info, body):
+        """Store a snapshot unless it matches the newest one, returns the file name or None"""
+        with self._lock:
+            name = self._add(created, info, body)
+            if name:
+                self._apply_retention()
+                self._save_index()
+        return name
+
+    def adopt_legacy(self, root='.'):
+        """Copy old autosave_*.json files from the bot directory into the snapshot store
+
+        The originals stay where they are and adopted copies are exempt from
+        retention, so no history is lost. Returns (new legacy files, adopted).
+        """
+        with self._lock:
+            self._load_index()
+            legacy = sorted(name for name in os.listdir(root)
+                            if name.startswith('autosave_')
+                            and name.endswith('.json')
+                            and name not in self._adopted)
+            if not legacy:
+                return 0, 0
+
+            adopted = 0
+            for name in legacy:
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        document = json.load(f)
+                    info = document.pop('save_info', {})
+                    try:
+                        created = datetime.strptime(name[9:24],
+                                                    '%Y%m%d_%H%M%S')
+                    except ValueError:
+                        created = datetime.fromtimestamp(os.path.getmtime(path))
+                    body = json.dumps(document,
+                                      sort_keys=True,
+                                      separators=(',', ':'))
+                    if self._add(created, info, body, legacy=True):
+                        adopted += 1
+                    self._adopted.add(name)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"⚠️ Could not adopt {name}: {e}")
+            self._save_index()
+        return len(legacy), adopted
+
+    def _load_index(self):
+        if self._entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                self._entries = index['snapshots']
+                self._adopted = set(index.get('adopted_legacy', ()))
+            except FileNotFoundError:
+                self._entries = []
+            except (ValueError, KeyError) as e:
+                logger.warning(
+                    f"⚠️ Snapshot index unreadable ({e}) - rebuilding from directory"
+                )
+                self._entries = []
+                for name in sorted(os.listdir(self.directory)):
+                    if not (name.startswith('autosave_')
+                            and name.endswith('.json.gz')):
+                        continue
+                    entry = {
+                        'file':
+                        name,
+                        'created':
+                        datetime.strptime(name[9:24],
+                                          '%Y%m%d_%H%M%S').isoformat(),
+                        'hash':
+                        None,
+                        'bytes':
+                        os.path.getsize(os.path.join(self.directory, name))
+                    }
+                    # Adopted legacy files are recognizable by name
+                    if name.endswith(self.LEGACY_SUFFIX):
+                        entry['legacy'] = True
+                        self._adopted.add(name[:24] + '.json')
+                    self._entries.append(entry)
+                self._entries.sort(key=lambda entry: entry['created'])
+        return self._entries
+
+    def _add(self, created, info, body, legacy=False):
+        entries = self._load_index()
+        digest = self.content_hash(body)
+        # Legacy files are copied 1:1, so a rebuilt index still knows them
+        if not legacy and entries and entries[-1]['hash'] == digest:
+            return None
+
+        name = f"autosave_{created.strftime('%Y%m%d_%H%M%S')}" + (
+            self.LEGACY_SUFFIX if legacy else '.json.gz')
+        # Same document layout as before, just compressed
+        document = json.dumps({'save_info': info, **json.loads(body)})
+        path = os.path.join(self.directory, name)
+        temp_path = path + '.tmp'
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            f.write(document)
+        os.replace(temp_path, path)
+
+        entries[:] = [entry for entry in entries if entry['file'] != name]
+        entry = {
+            'file': name,
+            'created': created.isoformat(),
+            'hash': digest,
+            'bytes': os.path.getsize(path)
+        }
+        if legacy:
+            entry['legacy'] = True
+        entries.append(entry)
+        entries.sort(key=lambda entry: entry['created'])
+        return name
+
+    def _apply_retention(self):
+        entries = self._load_index()
+        # Adopted legacy autosaves are history - they are never pruned
+        newest_first = [
+            entry for entry in entries[::-1] if not entry.get('legacy')
+        ]
+        if not newest_first:
+            return
+        keep = {entry['file'] for entry in entries if entry.get('legacy')}
+        keep.add(newest_first[0]['file'])
+        for bucket_format, count in self.RETENTION:
+            buckets = set()
+            for entry in newest_first:
+                bucket = datetime.fromisoformat(
+                    entry['created']).strftime(bucket_format)
+                if bucket in buckets:
+                    continue
+                if len(buckets) >= count:
+                    break
+                buckets.add(bucket)
+                keep.add(entry['file'])
+
+        for entry in entries:
+            if entry['file'] not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, entry['file']))
+                except FileNotFoundError:
+                    pass
+        entries[:] = [entry for entry in entries if entry['file'] in keep]
+
+    def _save_index(self):
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'snapshots': self._entries,
+                    'adopted_legacy': sorted(self._adopted)
+                },
+                f,
+                indent=2)
+        os.replace(temp_path, self.index_path)
+
+
+class WriteBehind:
+    """Collects changed keys per dataset and writes them in one batch after a short window"""
+
+    def __init__(self, writer, window=PERSIST_FLUSH_WINDOW):
+        self.writer = writer  # async callable(changes)
+        self.window = window
+        self.flushes = 0
+        self.last_flush = None
+        self._dirty = {}  # dataset -> {key: value}
+        self._timer = None
+        self._lock = asyncio.Lock()
+
+    def mark(self, dataset, key, value=None):
+        """Mark one key dirty - the newest value for a key wins"""
+        self._dirty.setdefault(dataset, {})[key] = value
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def pending(self):
+        return sum(len(keys) for keys in self._dirty.values())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"❌ Write-behind flush failed: {e}")
+            # Try again after the next window
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Write everything marked so far"""
+        async with self._lock:
+            if not self._dirty:
+                return
+            changes, self._dirty = self._dirty, {}
+            try:
+                await self.writer(changes)
+            except BaseException:
+                # Keep the failed batch unless a key changed again meanwhile
+                for dataset, keys in changes.items():
+                    current = self._dirty.setdefault(dataset, {})
+                    for key, value in keys.items():
+                        current.setdefault(key, value)
+                raise
+            self.flushes += 1
+            self.last_flush = datetime.now()
+
+    async def close(self):
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+
+
+# =============================================================================
+# PLAYER INDEXES
+# =============================================================================
+
+
+class PresenceIndex:
+    """Cluster-wide index of which server each player is online on"""
+
+    def __init__(self):
+        self._by_eos = {}  # eos_id -> {'name', 'server_id', 'last_seen'}
+        self._by_name = {}  # player_name -> eos_id
+        self._online = {}  # player_name -> server_id
+        self._server_seen = {}  # server_id -> time of the last complete scan
+
+    def mark_online(self, server_id, eos_id, player_name):
+        entry = self._by_eos.get(eos_id)
+        if entry is not None and entry['name'] != player_name:
+            # Renamed - the old name is no longer online anywhere
+            self._online.pop(entry['name'], None)
+            if self._by_name.get(entry['name']) == eos_id:
+                del self._by_name[entry['name']]
+
+        self._by_eos[eos_id] = {
+            'name': player_name,
+            'server_id': server_id,
+            'last_seen': datetime.now()
+        }
+        self._by_name[player_name] = eos_id
+        self._online[player_name] = server_id
+
+    def mark_offline(self, server_id, eos_id):
+        entry = self._by_eos.get(eos_id)
+        # The player may already have moved on to another map
+        if entry is None or entry['server_id'] != server_id:
+            return
+        entry['server_id'] = None
+        entry['last_seen'] = self._server_seen.get(server_id, datetime.now())
+        self._online.pop(entry['name'], None)
+
+    def server_scanned(self, server_id):
+        self._server_seen[server_id] = datetime.now()
+
+    def server_ids(self):
+        """Servers anyone is online on or that were scanned"""
+        return set(self._online.values()) | set(self._server_seen)
+
+    def drop_server(self, server_id):
+        """Forget everyone online on a removed or disabled server"""
+        for entry in self._by_eos.values():
+            if entry['server_id'] == server_id:
+                entry['server_id'] = None
+                self._online.pop(entry['name'], None)
+        self._server_seen.pop(server_id, None)
+
+    def locate(self, player_name):
+        """Server the player is online on, or None"""
+        return self._online.get(player_name)
+
+    def is_online(self, player_name):
+        return player_name in self._online
+
+    def online_players(self):
+        """{player_name: server_id} of everyone currently online"""
+        return self._online
+
+
+class PlayerSearchIndex:
+    """Case-insensitive substring search over player names via 1-3 character n-grams"""
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._names = {}  # player_name -> lowercase name
+        self._sorted = []  # (lowercase name, player_name) for prefix lookups
+        self._eos_valid = {}  # player_name -> EOS ID looks valid
+        # n-gram -> (lowercase name, player_name) sorted like _sorted, so
+        # the best matches of any posting are simply its first entries
+        self._grams = {}
+
+    @classmethod
+    def _ngrams(cls, text):
+        return {
+            text[i:i + size]
+            for size in range(1, cls.GRAM_SIZE + 1)
+            for i in range(len(text) - size + 1)
+        }
+
+    def add(self, player_name, eos_id):
+        self._eos_valid[player_name] = bool(
+            eos_id) and len(eos_id) == 32 and eos_id.isalnum()
+        if player_name in self._names:
+            return
+
+        lower = player_name.lower()
+        self._names[player_name] = lower
+        entry = (lower, player_name)
+        bisect.insort(self._sorted, entry)
+        for gram in self._ngrams(lower):
+            bisect.insort(self._grams.setdefault(gram, []), entry)
+
+    def rebuild(self, eos_mapping):
+        self._names = {}
+        self._eos_valid = {}
+        for player_name, eos_id in eos_mapping.items():
+            self._eos_valid[player_name] = bool(
+                eos_id) and len(eos_id) == 32 and eos_id.isalnum()
+            self._names[player_name] = player_name.lower()
+        self._sorted = sorted(
+            (lower, name) for name, lower in self._names.items())
+
+        # Walking the sorted names keeps every posting sorted as well
+        self._grams = {}
+        for entry in self._sorted:
+            for gram in self._ngrams(entry[0]):
+                self._grams.setdefault(gram, []).append(entry)
+
+    def eos_valid(self, player_name):
+        return self._eos_valid.get(player_name, False)
+
+    def names(self):
+        """All player names in search order"""
+        return (name for _, name in self._sorted)
+
+    def search(self, query, limit=25, preferred=()):
+        """Best matches: preferred names first, then prefix matches, then other substring matches"""
+        query = query.strip().lower()
+        results = sorted(name for name in preferred
+                         if name in self._names and query in self._names[name])
+        results = results[:limit]
+        seen = set(results)
+
+        # Prefix matches straight from the sorted names
+        index = bisect.bisect_left(self._sorted, (query, ""))
+        while len(results) < limit and index < len(self._sorted):
+            lower, name = self._sorted[index]
+            if not lower.startswith(query):
+                break
+            if name not in seen:
+                results.append(name)
+                seen.add(name)
+            index += 1
+
+        if len(results) >= limit or not query:
+            return results
+
+        # Remaining substring matches in name order from the n-gram postings
+        if len(query) <= self.GRAM_SIZE:
+            candidates = self._grams.get(query, ())
+        else:
+            # Verify the rarest trigram's postings against the full query
+            candidates = min(
+                (self._grams.get(query[i:i + self.GRAM_SIZE], ())
+                 for i in range(len(query) - self.GRAM_SIZE + 1)),
+                key=len)
+        for lower, name in candidates:
+            if name not in seen and query in lower:
+                results.append(name)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def __len__(self):
+        return len(self._names)
+
+
+class MappingIndex:
+    """Reverse indexes over eos_mapping and discord_mapping"""
+
+    def __init__(self):
+        # Inner dicts keep link order - the first link wins, like before
+        self._player_discord = {}  # player_name -> {discord_id: None}
+        self._eos_names = {}  # eos_id -> set of player names
+
+    @staticmethod
+    def _add(index, key, value):
+        index.setdefault(key, {})[value] = None
+
+    @staticmethod
+    def _discard(index, key, value):
+        values = index.get(key)
+        if values is not None:
+            values.pop(value, None)
+            if not values:
+                del index[key]
+
+    def rebuild(self, eos_mapping, discord_mapping):
+        self._player_discord = {}
+        self._eos_names = {}
+        for player_name, eos_id in eos_mapping.items():
+            self._eos_names.setdefault(eos_id, set()).add(player_name)
+        for discord_id, link in discord_mapping.items():
+            self.link(discord_id, None, link)
+
+    def set_eos(self, player_name, old_eos, new_eos):
+        if old_eos is not None:
+            names = self._eos_names.get(old_eos)
+            if names is not None:
+                names.discard(player_name)
+                if not names:
+                    del self._eos_names[old_eos]
+        self._eos_names.setdefault(new_eos, set()).add(player_name)
+
+    def link(self, discord_id, old_link, new_link):
+        """Move a Discord ID from its previous link (if any) to the new one"""
+        if old_link:
+            self._discard(self._player_discord, old_link.get('player_name'),
+                          discord_id)
+        if new_link:
+            self._add(self._player_discord, new_link.get('player_name'),
+                      discord_id)
+
+    def discord_for_player(self, player_name):
+        return next(iter(self._player_discord.get(player_name, ())), None)
+
+    def discords_for_player(self, player_name):
+        return list(self._player_discord.get(player_name, ()))
+
+    def names_for_eos(self, eos_id):
+        return self._eos_names.get(eos_id, set())
+
+
+class StatisticsAggregator:
+    """Reward and player counters kept up to date by claim, delete, link and scan events"""
+
+    def __init__(self):
+        self.rebuild({}, {}, {})
+
+    @staticmethod
+    def _eos_valid(eos_id):
+        return bool(eos_id) and len(eos_id) == 32 and eos_id.isalnum()
+
+    def rebuild(self, rewards_data, eos_mapping, discord_mapping):
+        """Full recount - only needed after loading"""
+        self.total_rewards = 0
+        self.active_players = 0
+        self.level_distribution = {}
+        self._by_count = {}  # reward count -> {player_name: None}
+        for player_name, levels in rewards_data.items():
+            if levels:
+                self.active_players += 1
+                self._by_count.setdefault(len(levels), {})[player_name] = None
+            for level in levels:
+                self.total_rewards += 1
+                self.level_distribution[str(level)] = (
+                    self.level_distribution.get(str(level), 0) + 1)
+        self.total_players = len(eos_mapping)
+        self.invalid_eos = {
+            player_name
+            for player_name, eos_id in eos_mapping.items()
+            if not self._eos_valid(eos_id)
+        }
+        self.discord_links = len(discord_mapping)
+
+    def claim_added(self, player_name, level, player_claims):
+        self.total_rewards += 1
+        self.level_distribution[str(level)] = (
+            self.level_distribution.get(str(level), 0) + 1)
+        if player_claims == 1:
+            self.active_players += 1
+        self._rank(player_name, player_claims - 1, player_claims)
+
+    def claim_removed(self, player_name, level, player_claims):
+        self.total_rewards -= 1
+        count = self.level_distribution.get(str(level), 0) - 1
+        if count > 0:
+            self.level_distribution[str(level)] = count
+        else:
+            self.level_distribution.pop(str(level), None)
+        if player_claims == 0:
+            self.active_players -= 1
+        self._rank(player_name, player_claims + 1, player_claims)
+
+    def _rank(self, player_name, old_count, new_count):
+        players = self._by_count.get(old_count)
+        if players is not None:
+            players.pop(player_name, None)
+            if not players:
+                del self._by_count[old_count]
+        if new_count:
+            self._by_count.setdefault(new_count, {})[player_name] = None
+
+    def top_players(self):
+        """Yield (player_name, reward count), most rewards first"""
+        for count in sorted(self._by_count, reverse=True):
+            for player_name in self._by_count[count]:
+                yield player_name, count
+
+    def player_mapped(self, player_name, old_eos, new_eos):
+        if old_eos is None:
+            self.total_players += 1
+        if self._eos_valid(new_eos):
+            self.invalid_eos.discard(player_name)
+        else:
+            self.invalid_eos.add(player_name)
+
+    def link_added(self, is_new):
+        """Count a link - re-linking an already linked Discord ID adds nothing"""
+        if is_new:
+            self.discord_links += 1
+
+    def snapshot(self):
+        """Consistent copy of all counters"""
+        return {
+            'total_rewards_given': self.total_rewards,
+            'active_players': self.active_players,
+            'level_distribution': dict(self.level_distribution),
+            'total_players': self.total_players,
+            'valid_eos': self.total_players - len(self.invalid_eos),
+            'invalid_eos': len(self.invalid_eos),
+            'discord_links': self.discord_links
+        }
+
 
 class ARKBot(commands.Bot):
 
@@ -410,24 +2301,59 @@ class ARKBot(commands.Bot):
 
         self.rewards_data = {}
         self.config = {}
+        self.reward_plans = {}  # level -> RewardPlan
+        self.claimable_mask = 0  # bits of all configured levels
+        self.claim_outbox = {}  # claim_id -> ClaimTransaction
+        self._pending_claims = {}  # (player_name, level) -> claim_id
+        self.claim_locks = KeyedLock()  # player_name -> check/deliver/record
         self.eos_mapping = {}
         self.discord_mapping = {}
         self.listen_channels = []
         self.rcon_log_channel = None
         self.player_events_channel = None
         self.last_player_check = datetime.now()
-        self.last_player_list = {}
         self.last_player_count = {}
+        self.online_players = {}  # server_id -> {eos_id: player_name}
+        self.presence = PresenceIndex()
+        self.player_search = PlayerSearchIndex()
+        self.mapping_index = MappingIndex()
+        self.statistics = StatisticsAggregator()
+        self.store = SqliteStore(DATABASE_FILE)
+        self.write_behind = WriteBehind(self._write_changes)
+        self.snapshots = SnapshotManager()
+        self.scan_schedule = {}  # server_id -> adaptive scan state
+        self._scan_lock = asyncio.Lock()
+        self._background_tasks = set()
 
         # Multi-server support
         self.servers = {}
         self.default_server = None
+        # Blocking work never touches asyncio's shared default executor
+        self.rcon_executor = InstrumentedExecutor("rcon-io",
+                                                  RCON_EXECUTOR_WORKERS)
+        self.disk_executor = InstrumentedExecutor("disk-io",
+                                                  DISK_EXECUTOR_WORKERS)
+        self.rcon_pool = RconConnectionPool(executor=self.rcon_executor)
+        self.rcon_schedulers = {}
+        self.circuit_breakers = {}
+        self.rcon_reads = SingleFlight()
+        self.journal = ClaimJournal(JOURNAL_FILE, self.disk_executor)
+        self._compacting = False
 
     async def setup_hook(self):
         await self.load_data()
+        try:
+            found, adopted = await self.run_store(self.snapshots.adopt_legacy)
+            if found:
+                logger.info(
+                    f"🗂️ Copied {adopted} of {found} legacy autosave files into {SNAPSHOT_DIR}/ (originals left in place)"
+                )
+        except Exception as e:
+            logger.error(f"Error adopting legacy autosaves: {e}")
         self.autosave_task.start()
         self.auto_player_scan_task.start()
         self.heartbeat_task.start()
+        self.claim_outbox_task.start()
 
         # Verify commands are registered
         commands = self.tree.get_commands()
@@ -441,28 +2367,44 @@ class ARKBot(commands.Bot):
     async def load_data(self):
         """Load all data files with improved server loading"""
         try:
-            # Load rewards data
-            if os.path.exists(REWARDS_FILE):
-                async with aiofiles.open(REWARDS_FILE, 'r') as f:
-                    content = await f.read()
-                    self.rewards_data = json.loads(content)
+            await self.run_store(self.store.open)
+            # Reloading must not drop changes that are still queued
+            await self.journal.commit()
+            await self.write_behind.flush()
+            migrated = await self.run_store(self.store.is_migrated)
+            if migrated:
+                # Players, claims and links live in SQLite
+                (self.rewards_data, self.eos_mapping,
+                 self.discord_mapping) = await self.run_store(
+                     self.store.load_players)
             else:
-                self.rewards_data = {
-                    "User_Gesperrt": [1, 10, 20, 50, 70],
-                    "StreetKingPaddy": [1, 10],
-                    "Duddy1768": [1],
-                    "PlayerExample1": [],
-                    "PlayerExample2": [],
-                    "TestPlayer": [1, 10, 20],
-                    "AdminPlayer": [1, 10, 20, 50, 70, 100],
-                    "Patrick": [1, 10],
-                    "AmissaPlayer1": [],
-                    "AmissaPlayer2": []
-                }
+                # Legacy JSON files are only read until they are migrated
+                # Load rewards data
+                if os.path.exists(REWARDS_FILE):
+                    async with aiofiles.open(REWARDS_FILE,
+                                             'r',
+                                             executor=self.disk_executor) as f:
+                        content = await f.read()
+                        self.rewards_data = json.loads(content)
+                else:
+                    self.rewards_data = {
+                        "User_Gesperrt": [1, 10, 20, 50, 70],
+                        "StreetKingPaddy": [1, 10],
+                        "Duddy1768": [1],
+                        "PlayerExample1": [],
+                        "PlayerExample2": [],
+                        "TestPlayer": [1, 10, 20],
+                        "AdminPlayer": [1, 10, 20, 50, 70, 100],
+                        "Patrick": [1, 10],
+                        "AmissaPlayer1": [],
+                        "AmissaPlayer2": []
+                    }
 
             # Load config
             if os.path.exists(CONFIG_FILE):
-                async with aiofiles.open(CONFIG_FILE, 'r') as f:
+                async with aiofiles.open(CONFIG_FILE,
+                                         'r',
+                                         executor=self.disk_executor) as f:
                     content = await f.read()
                     self.config = json.loads(content)
                     self.listen_channels = self.config.get(
@@ -540,44 +2482,66 @@ class ARKBot(commands.Bot):
                 self.rcon_log_channel = None
                 self.player_events_channel = None
 
-            # Load EOS mapping
-            if os.path.exists(EOS_MAPPING_FILE):
-                async with aiofiles.open(EOS_MAPPING_FILE, 'r') as f:
-                    content = await f.read()
-                    self.eos_mapping = json.loads(content)
-            else:
-                self.eos_mapping = {
-                    "User_Gesperrt": "13dbca05ba8166e2e60c50fe271f2417",
-                    "StreetKingPaddy": "28838c3022e0cb886568abcaa6f37f8d",
-                    "StreetkingPaddy": "28838c3022e0cb886568abcaa6f37f8d",
-                    "Duddy1768": "5f8a7b2c9d1e3a4f6b8c2d9e1a3f5b7c",
-                    "PlayerExample1": "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d",
-                    "PlayerExample2": "9z8y7x6w5v4u3t2s1r0q9p8o7n6m5l4k",
-                    "TestPlayer": "fedcba9876543210fedcba9876543210",
-                    "AdminPlayer": "0123456789abcdef0123456789abcdef",
-                    "Patrick": "a1b2c3d4e5f6789012345678901234567890abcd",
-                    "AmissaPlayer1": "123456789abcdef0123456789abcdef01",
-                    "AmissaPlayer2": "abcdef0123456789abcdef0123456789a"
-                }
+            # Reward commands are parsed and validated once, not per claim
+            self.reward_plans, errors = compile_reward_plans(
+                self.config.get('levels', {}))
+            for error in errors:
+                logger.error(f"❌ Invalid reward config - {error}")
+            logger.info(
+                f"🎁 Compiled {len(self.reward_plans)} reward levels ({len(errors)} rejected)"
+            )
+            LEVEL_ORDINALS.register(self.reward_plans)
+            self.claimable_mask = LEVEL_ORDINALS.mask(self.reward_plans)
+            self.rewards_data = {
+                player_name: LevelBitset.from_levels(levels)
+                for player_name, levels in self.rewards_data.items()
+            }
 
-            # Load Discord mapping
-            if os.path.exists(DISCORD_MAPPING_FILE):
-                async with aiofiles.open(DISCORD_MAPPING_FILE, 'r') as f:
-                    content = await f.read()
-                    self.discord_mapping = json.loads(content)
-            else:
-                self.discord_mapping = {
-                    "239496734328356874": {
-                        "eos_id": "13dbca05ba8166e2e60c50fe271f2417",
-                        "player_name": "User_Gesperrt",
-                        "original_input": "User_Gesperrt",
-                        "linked_at": "2025-07-07T12:43:11.776789"
+            if not migrated:
+                # Load EOS mapping
+                if os.path.exists(EOS_MAPPING_FILE):
+                    async with aiofiles.open(EOS_MAPPING_FILE,
+                                             'r',
+                                             executor=self.disk_executor) as f:
+                        content = await f.read()
+                        self.eos_mapping = json.loads(content)
+                else:
+                    self.eos_mapping = {
+                        "User_Gesperrt": "13dbca05ba8166e2e60c50fe271f2417",
+                        "StreetKingPaddy": "28838c3022e0cb886568abcaa6f37f8d",
+                        "StreetkingPaddy": "28838c3022e0cb886568abcaa6f37f8d",
+                        "Duddy1768": "5f8a7b2c9d1e3a4f6b8c2d9e1a3f5b7c",
+                        "PlayerExample1": "1a2b3c4d5e6f7a8b9c0d1e2f3a4b5c6d",
+                        "PlayerExample2": "9z8y7x6w5v4u3t2s1r0q9p8o7n6m5l4k",
+                        "TestPlayer": "fedcba9876543210fedcba9876543210",
+                        "AdminPlayer": "0123456789abcdef0123456789abcdef",
+                        "Patrick": "a1b2c3d4e5f6789012345678901234567890abcd",
+                        "AmissaPlayer1": "123456789abcdef0123456789abcdef01",
+                        "AmissaPlayer2": "abcdef0123456789abcdef0123456789a"
+                    }
+
+                # Load Discord mapping
+                if os.path.exists(DISCORD_MAPPING_FILE):
+                    async with aiofiles.open(DISCORD_MAPPING_FILE,
+                                             'r',
+                                             executor=self.disk_executor) as f:
+                        content = await f.read()
+                        self.discord_mapping = json.loads(content)
+                else:
+                    self.discord_mapping = {
+                        "239496734328356874": {
+                            "eos_id": "13dbca05ba8166e2e60c50fe271f2417",
+                            "player_name": "User_Gesperrt",
+                            "original_input": "User_Gesperrt",
+                            "linked_at": "2025-07-07T12:43:11.776789"
+                        }
                     }
-                }
 
             # FIXED: Load servers configuration with proper validation
             if os.path.exists(SERVERS_FILE):
-                async with aiofiles.open(SERVERS_FILE, 'r') as f:
+                async with aiofiles.open(SERVERS_FILE,
+                                         'r',
+                                         executor=self.disk_executor) as f:
                     content = await f.read()
                     loaded_servers = json.loads(content)
 
@@ -661,9 +2625,57 @@ class ARKBot(commands.Bot):
 
                 logger.info(f"🏗️ Created default server configuration")
 
+            # servers.json stays the editable config, runtime status survives restarts in SQLite
+            stored_servers = await self.run_store(self.store.load_servers)
+            for server_id, server_config in self.servers.items():
+                stored = stored_servers.get(server_id, {})
+                for field in ('status', 'connection_tested'):
+                    if field in stored:
+                        server_config[field] = stored[field]
+            await self.run_store(self.store.sync_servers, self.servers)
+
+            if not migrated:
+                await self.run_store(self.store.import_json,
+                                     self.rewards_data, self.eos_mapping,
+                                     self.discord_mapping)
+                logger.info(
+                    f"🗄️ Migrated JSON data to SQLite: {len(self.eos_mapping)} players, {len(self.discord_mapping)} links"
+                )
+
+            # Claims that were not fully delivered yet
+            self.claim_outbox = {}
+            self._pending_claims = {}
+            for txn in await self.run_store(self.store.load_outbox):
+                self._add_pending(txn)
+
+            # Replay journal events the database has not folded in yet
+            folded_seq = int(await self.run_store(self.store.get_meta,
+                                                  'journal_seq', 0))
+            entries = await self.run_store(self.journal.read, folded_seq)
+            replayed = 0
+            for entry in entries:
+                if entry['seq'] > folded_seq:
+                    self._apply_journal_event(entry)
+                    replayed += 1
+            if replayed:
+                logger.info(f"📜 Replayed {replayed} journal entries")
+
+            self.rebuild_player_indexes()
+
+            # Server settings may have changed - drop pooled sessions and
+            # the online players of servers that are gone
+            self.drop_unscanned_servers()
+            await self.rcon_pool.close_all()
+            self.circuit_breakers = {}
+            self.rcon_reads.invalidate()
+
             # Set default server
+            stored_default = await self.run_store(self.store.get_meta,
+                                                  'default_server')
             if self.servers:
-                if "agilitzia_ragnarok" in self.servers:
+                if stored_default in self.servers:
+                    self.default_server = stored_default
+                elif "agilitzia_ragnarok" in self.servers:
                     self.default_server = "agilitzia_ragnarok"
                 else:
                     # Use first available server
@@ -680,37 +2692,29 @@ class ARKBot(commands.Bot):
             logger.error(f"Error loading data: {e}")
 
     async def save_data(self):
-        """Save all data files"""
+        """Flush pending changes and write an autosave snapshot"""
         try:
-            # Save rewards data
-            async with aiofiles.open(REWARDS_FILE, 'w') as f:
-                await f.write(json.dumps(self.rewards_data, indent=2))
-
-            # Save EOS mapping
-            async with aiofiles.open(EOS_MAPPING_FILE, 'w') as f:
-                await f.write(json.dumps(self.eos_mapping, indent=2))
-
-            # Save Discord mapping
-            async with aiofiles.open(DISCORD_MAPPING_FILE, 'w') as f:
-                await f.write(json.dumps(self.discord_mapping, indent=2))
-
-            # Save servers configuration
-            async with aiofiles.open(SERVERS_FILE, 'w') as f:
-                await f.write(json.dumps(self.servers, indent=2))
-
-            # Create autosave backup
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Rows are written by the write-behind queue as they change
+            self.write_behind.mark('servers', '*')
+            await self.write_behind.flush()
+            await self.compact_journal()
+
+            # Create autosave snapshot (skipped if nothing changed)
+            created = datetime.now()
+            save_info = {
+                "timestamp": created.isoformat(),
+                "save_type": "Scheduled Autosave",
+                "bot_version": "2.1_fixed_server_loading",
+                "total_players": len(self.rewards_data),
+                "total_eos_mappings": len(self.eos_mapping),
+                "total_discord_links": len(self.discord_mapping),
+                "total_servers": len(self.servers)
+            }
             autosave_data = {
-                "save_info": {
-                    "timestamp": datetime.now().isoformat(),
-                    "save_type": "Scheduled Autosave",
-                    "bot_version": "2.1_fixed_server_loading",
-                    "total_players": len(self.rewards_data),
-                    "total_eos_mappings": len(self.eos_mapping),
-                    "total_discord_links": len(self.discord_mapping),
-                    "total_servers": len(self.servers)
+                "rewards_data": {
+                    player_name: levels.to_list()
+                    for player_name, levels in self.rewards_data.items()
                 },
-                "rewards_data": self.rewards_data,
                 "eos_mapping_data": self.eos_mapping,
                 "discord_mapping_data": self.discord_mapping,
                 "server_data": self.servers,
@@ -718,46 +2722,114 @@ class ARKBot(commands.Bot):
                 "statistics": self.get_statistics()
             }
 
-            async with aiofiles.open(f'autosave_{timestamp}.json', 'w') as f:
-                await f.write(json.dumps(autosave_data, indent=2))
+            # Serialized on the loop - the data keeps changing underneath
+            body = json.dumps(autosave_data,
+                              sort_keys=True,
+                              separators=(',', ':'))
+            snapshot = await self.run_store(self.snapshots.write, created,
+                                            save_info, body)
 
-            logger.info("Data saved successfully")
+            if snapshot:
+                logger.info(f"Data saved successfully - snapshot {snapshot}")
+            else:
+                logger.info("Data saved successfully - snapshot unchanged")
 
         except Exception as e:
             logger.error(f"Error saving data: {e}")
 
     def get_statistics(self):
         """Generate bot statistics"""
-        level_distribution = {}
-        total_rewards = 0
-
-        for player, levels in self.rewards_data.items():
-            total_rewards += len(levels)
-            for level in levels:
-                level_distribution[str(level)] = level_distribution.get(
-                    str(level), 0) + 1
-
+        stats = self.statistics.snapshot()
         return {
             "total_rewards_given":
-            total_rewards,
+            stats['total_rewards_given'],
             "active_players":
-            len([p for p in self.rewards_data.values() if p]),
+            stats['active_players'],
             "level_distribution":
-            level_distribution,
+            stats['level_distribution'],
             "total_servers":
             len(self.servers),
             "enabled_servers":
             len([s for s in self.servers.values() if s.get('enabled', True)])
         }
 
+    def get_rcon_scheduler(self, server_id):
+        """Scheduler queue in front of one server's RCON sessions"""
+        server = self.servers.get(server_id, {})
+        rate_limit = float(
+            server.get('rcon_rate_limit', RCON_DEFAULT_RATE_LIMIT))
+
+        scheduler = self.rcon_schedulers.get(server_id)
+        if scheduler is None:
+            scheduler = RconScheduler(server_id, rate_limit=rate_limit)
+            self.rcon_schedulers[server_id] = scheduler
+        scheduler.rate_limit = rate_limit
+        return scheduler
+
+    def get_circuit_breaker(self, server_id):
+        """Circuit breaker guarding one server"""
+        breaker = self.circuit_breakers.get(server_id)
+        if breaker is None:
+            server = self.servers.get(server_id, {})
+            # Servers last seen offline start half-open - the first call
+            # is the probe that decides, instead of failing fast for a
+            # whole cooldown after every restart
+            breaker = CircuitBreaker(
+                start_half_open=server.get('status') == 'OFFLINE')
+            self.circuit_breakers[server_id] = breaker
+        return breaker
+
+    def _record_rcon_outcome(self, server_id, success):
+        """Feed the circuit breaker and keep the server status in sync"""
+        breaker = self.get_circuit_breaker(server_id)
+        old_state = breaker.state
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+        server = self.servers.get(server_id)
+        if server is None or breaker.state == old_state:
+            return
+        self.write_behind.mark('servers', '*')
+        if breaker.state == CircuitBreaker.OPEN:
+            server['status'] = 'OFFLINE'
+            logger.warning(
+                f"⛔ Circuit opened for {server.get('name', server_id)} - failing fast for {breaker.reset_timeout}s"
+            )
+        elif breaker.state == CircuitBreaker.CLOSED:
+            server['status'] = 'ONLINE'
+            logger.info(
+                f"✅ Circuit closed for {server.get('name', server_id)} - server reachable again"
+            )
+
+    @staticmethod
+    def _retry_delay(attempt):
+        """Exponential backoff with jitter"""
+        delay = min(RCON_RETRY_MAX_DELAY, RCON_RETRY_BASE_DELAY * 2**attempt)
+        return random.uniform(delay / 2, delay)
+
     async def execute_rcon_command(self,
                                    command,
                                    server_id=None,
-                                   command_context=None):
+                                   command_context=None,
+                                   priority=RCON_PRIORITY_ADMIN):
         """Execute RCON command on ARK server with async protection"""
         if server_id is None:
             server_id = self.default_server
 
+        # Concurrent identical reads share one request
+        if is_read_only_rcon_command(command):
+            return await self.rcon_reads.do(
+                (server_id, command.strip()),
+                lambda: self._execute_rcon_command(command, server_id,
+                                                   priority))
+
+        return await self._execute_rcon_command(command, server_id,
+                                                priority)
+
+    async def _execute_rcon_command(self, command, server_id, priority):
+        """Run one RCON command through breaker, retries and scheduler"""
         if not server_id or server_id not in self.servers:
             logger.error(f"Server {server_id} not found")
             return None
@@ -767,21 +2839,46 @@ class ARKBot(commands.Bot):
             logger.error(f"Server {server_id} is disabled")
             return None
 
+        breaker = self.get_circuit_breaker(server_id)
+        # Use longer timeout to prevent premature disconnects
+        timeout = server.get('connection_timeout', 10)
+        attempts = 1 + max(0, int(server.get('retry_attempts', 0)))
+        # Commands that may already have run are only replayed if harmless
+        replay_safe = is_read_only_rcon_command(command)
         start_time = datetime.now()
-        try:
-            # Use longer timeout to prevent premature disconnects
-            timeout = server.get('connection_timeout', 10)
+        acks = [None]  # the response, as soon as the server answered
 
-            # Run RCON in thread pool with timeout protection
-            loop = asyncio.get_event_loop()
-            response = await asyncio.wait_for(loop.run_in_executor(
-                None, self._sync_rcon_command, server, command, timeout),
-                                              timeout=timeout + 1)
+        for attempt in range(attempts):
+            if not breaker.allow():
+                logger.debug(
+                    f"⛔ Circuit open for {server['name']} - skipped: {command}")
+                return None
 
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+            try:
+                # Queue behind the server's scheduler, then run with timeout
+                # protection (connect/auth and the command each get `timeout`)
+                response = await self.get_rcon_scheduler(server_id).submit(
+                    lambda: asyncio.wait_for(self._pooled_rcon_command(
+                        server_id, server, command, timeout, acks),
+                                             timeout=2 * timeout + 1),
+                    priority=priority)
+            except RconConnectError as e:
+                can_retry = True
+                error = e
+            except asyncio.TimeoutError:
+                can_retry = replay_safe
+                error = f"timeout after {timeout}s"
+            except Exception as e:
+                can_retry = replay_safe
+                error = e
+            else:
+                acks[0] = response
 
-            if response is not None:
+            # An acknowledged command counts, even if we gave up afterwards
+            if acks[0] is not None:
+                response = acks[0]
+                self._record_rcon_outcome(server_id, True)
+                execution_time = (datetime.now() - start_time).total_seconds()
                 processed_response = self.process_server_response(
                     response, command)
                 logger.info(
@@ -789,41 +2886,269 @@ class ARKBot(commands.Bot):
                 )
                 logger.debug(f"Processed response: {processed_response}")
                 return processed_response
-            else:
+
+            self._record_rcon_outcome(server_id, False)
+            if not can_retry or attempt == attempts - 1:
+                execution_time = (datetime.now() - start_time).total_seconds()
                 logger.warning(
-                    f"No response from {server['name']} after {execution_time:.2f}s"
+                    f"No response from {server['name']} after {execution_time:.2f}s ({attempt + 1} attempt(s)): {error}"
                 )
                 return None
 
-        except asyncio.TimeoutError:
-            logger.warning(
-                f"RCON timeout on {server['name']} after {timeout}s")
-            return None
-        except Exception as e:
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-            logger.debug(
-                f"RCON Error on {server['name']}: {e} ({execution_time:.2f}s)")
-            return None
+            await asyncio.sleep(self._retry_delay(attempt))
 
-    def _sync_rcon_command(self, server, command, timeout=10):
-        """Synchronous RCON command execution for thread pool"""
-        if not RCON_AVAILABLE:
-            logger.warning(
-                "RCON not available - install mcrcon: pip install mcrcon")
-            return "❌ RCON module not available"
+        return None
+
+    async def _pooled_rcon_command(self,
+                                   server_id,
+                                   server,
+                                   command,
+                                   timeout=10,
+                                   acks=None):
+        """Run a command on a pooled RCON session"""
+        # Borrow a pooled session; a stale one gets a single fresh retry
+        for attempt in range(2):
+            try:
+                # Connect and login have their own deadline
+                client, reused = await asyncio.wait_for(
+                    self.rcon_pool.acquire(server_id,
+                                           server,
+                                           timeout,
+                                           fresh=attempt > 0),
+                    timeout=timeout)
+            except Exception as e:
+                raise RconConnectError(
+                    f"RCON connection failed to {server['host']}:{server['port']}: {e}"
+                ) from e
+
+            try:
+                response = await client.command(command, acks)
+            except asyncio.CancelledError:
+                await self.rcon_pool.discard(server_id, client)
+                raise
+            except Exception as e:
+                await self.rcon_pool.discard(server_id, client)
+                if reused and attempt == 0 and not isinstance(
+                        e, asyncio.TimeoutError):
+                    logger.debug(
+                        f"Pooled RCON session to {server['host']}:{server['port']} broken, reconnecting: {e}"
+                    )
+                    continue
+                raise
+
+            await self.rcon_pool.release(server_id, server, client)
+            return response
+
+    async def execute_rcon_batch(self,
+                                 commands,
+                                 server_id=None,
+                                 command_context=None,
+                                 priority=RCON_PRIORITY_ADMIN):
+        """Pipeline several RCON commands over one session, returns a result per command"""
+        results = [None] * len(commands)
+        if server_id is None:
+            server_id = self.default_server
+
+        if not server_id or server_id not in self.servers:
+            logger.error(f"Server {server_id} not found")
+            return results
+
+        server = self.servers[server_id]
+        if not server.get('enabled', True):
+            logger.error(f"Server {server_id} is disabled")
+            return results
+
+        if not commands:
+            return results
+
+        breaker = self.get_circuit_breaker(server_id)
+        timeout = server.get('connection_timeout', 10)
+        attempts = 1 + max(0, int(server.get('retry_attempts', 0)))
+        start_time = datetime.now()
+        responses = None
+        acks = [None] * len(commands)  # filled as the server answers
+
+        # Only connection failures are retried - nothing was sent yet
+        for attempt in range(attempts):
+            if not breaker.allow():
+                logger.debug(
+                    f"⛔ Circuit open for {server['name']} - skipped batch of {len(commands)}"
+                )
+                return results
+
+            try:
+                responses = await self.get_rcon_scheduler(server_id).submit(
+                    lambda: asyncio.wait_for(self._pooled_rcon_batch(
+                        server_id, server, commands, timeout, acks),
+                                             timeout=2 * timeout + 1),
+                    priority=priority,
+                    cost=len(commands))
+            except RconConnectError as e:
+                self._record_rcon_outcome(server_id, False)
+                if attempt == attempts - 1:
+                    logger.warning(
+                        f"RCON batch failed on {server['name']}: {e}")
+                    return results
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+            except asyncio.TimeoutError:
+                # Commands the server already acknowledged stay delivered
+                responses = acks
+                logger.warning(
+                    f"RCON batch timeout on {server['name']} after {timeout}s - {sum(1 for ack in acks if ack is not None)}/{len(commands)} acknowledged"
+                )
+            break
+
+        if responses is None:
+            return results
+
+        for index, (command, response) in enumerate(zip(commands,
+                                                        responses)):
+            if response is not None:
+                results[index] = self.process_server_response(
+                    response, command)
+
+        execution_time = (datetime.now() - start_time).total_seconds()
+        delivered = sum(1 for result in results if result is not None)
+        self._record_rcon_outcome(server_id, delivered > 0)
+        logger.info(
+            f"RCON batch sent to {server['name']}: {delivered}/{len(commands)} commands ({execution_time:.2f}s)"
+        )
+        return results
+
+    async def _pooled_rcon_batch(self,
+                                 server_id,
+                                 server,
+                                 commands,
+                                 timeout,
+                                 acks=None):
+        """Pipeline commands on one pooled session, None marks a failed command"""
+        if acks is None:
+            acks = [None] * len(commands)
+        for attempt in range(2):
+            try:
+                # Connect and login have their own deadline
+                client, reused = await asyncio.wait_for(
+                    self.rcon_pool.acquire(server_id,
+                                           server,
+                                           timeout,
+                                           fresh=attempt > 0),
+                    timeout=timeout)
+            except Exception as e:
+                raise RconConnectError(
+                    f"RCON connection failed to {server['host']}:{server['port']}: {e}"
+                ) from e
+
+            try:
+                outcomes = await client.command_many(commands, acks)
+            except asyncio.CancelledError:
+                await self.rcon_pool.discard(server_id, client)
+                raise
+            except Exception as e:
+                # The session died - keep what was acknowledged before
+                outcomes = [e if ack is None else ack for ack in acks]
+
+            failures = [
+                outcome for outcome in outcomes
+                if isinstance(outcome, BaseException)
+            ]
+            if not failures:
+                await self.rcon_pool.release(server_id, server, client)
+                return outcomes
+
+            await self.rcon_pool.discard(server_id, client)
+            # Only a stale session that answered nothing is safe to replay
+            if (reused and attempt == 0 and len(failures) == len(outcomes)
+                    and not any(
+                        isinstance(f, asyncio.TimeoutError)
+                        for f in failures)):
+                logger.debug(
+                    f"Pooled RCON session to {server['host']}:{server['port']} broken, reconnecting: {failures[0]}"
+                )
+                continue
 
-        try:
-            with MCRcon(server['host'],
-                        server['password'],
-                        port=server['port'],
-                        timeout=timeout) as mcr:
-                return mcr.command(command)
-        except Exception as e:
             logger.debug(
-                f"RCON connection failed to {server['host']}:{server['port']}: {e}"
+                f"RCON batch had {len(failures)} failed command(s) on {server['host']}:{server['port']}: {failures[0]}"
             )
-            return None
+            return [
+                None if isinstance(outcome, BaseException) else outcome
+                for outcome in outcomes
+            ]
+
+    async def stream_rcon_lines(self,
+                                command,
+                                server_id=None,
+                                priority=RCON_PRIORITY_ADMIN):
+        """Yield a command's response line by line as RCON packets arrive"""
+        if server_id is None:
+            server_id = self.default_server
+
+        if not server_id or server_id not in self.servers:
+            logger.error(f"Server {server_id} not found")
+            return
+
+        server = self.servers[server_id]
+        if not server.get('enabled', True):
+            logger.error(f"Server {server_id} is disabled")
+            return
+
+        if not self.get_circuit_breaker(server_id).allow():
+            raise RconError(f"Circuit open for {server['name']}")
+
+        timeout = server.get('connection_timeout', 10)
+        lines = asyncio.Queue()
+        end_of_stream = object()
+
+        async def pump():
+            # Borrow a pooled session; a stale one gets a single fresh retry
+            for attempt in range(2):
+                try:
+                    client, reused = await self.rcon_pool.acquire(
+                        server_id, server, timeout, fresh=attempt > 0)
+                except Exception as e:
+                    raise RconConnectError(
+                        f"RCON connection failed to {server['host']}:{server['port']}: {e}"
+                    ) from e
+
+                pumped = 0
+                try:
+                    async for line in client.command_lines(command):
+                        lines.put_nowait(line)
+                        pumped += 1
+                except asyncio.CancelledError:
+                    await self.rcon_pool.discard(server_id, client)
+                    raise
+                except Exception as e:
+                    await self.rcon_pool.discard(server_id, client)
+                    if (reused and attempt == 0 and pumped == 0
+                            and not isinstance(e, asyncio.TimeoutError)):
+                        continue
+                    raise
+
+                await self.rcon_pool.release(server_id, server, client)
+                return
+
+        task = asyncio.ensure_future(
+            self.get_rcon_scheduler(server_id).submit(pump,
+                                                      priority=priority))
+        task.add_done_callback(lambda _: lines.put_nowait(end_of_stream))
+
+        try:
+            while True:
+                line = await lines.get()
+                if line is end_of_stream:
+                    break
+                yield line
+
+            try:
+                task.result()
+            except Exception:
+                self._record_rcon_outcome(server_id, False)
+                raise
+            self._record_rcon_outcome(server_id, True)
+        finally:
+            if not task.done():
+                task.cancel()
 
     def process_server_response(self, response, command):
         """Process and enhance ARK server responses"""
@@ -891,113 +3216,632 @@ class ARKBot(commands.Bot):
         if len(response_str) > 0:
             return f"✅ Server Antwort: {response_str}"
 
-        return "✅ Command gesendet (Server reagierte still)"
+        return "✅ Command gesendet (Server reagierte still)"
+
+    async def probe_server(self, server_id):
+        """Probe one server, concurrent probes of the same server are shared"""
+        return await self.rcon_reads.do(
+            (server_id, "__probe__"),
+            lambda: self._scheduled_probe(server_id))
+
+    async def _scheduled_probe(self, server_id):
+        """Probe one server with version + ListPlayers through its scheduler"""
+        # Probes bypass the circuit breaker and reset it on success
+        result = await self.get_rcon_scheduler(server_id).submit(
+            lambda: self._probe_server_session(server_id),
+            priority=RCON_PRIORITY_ADMIN,
+            cost=2)
+        self._record_rcon_outcome(server_id, result['status'] == 'online')
+        return result
+
+    async def _probe_server_session(self, server_id):
+        """Probe one server on a fresh RCON session"""
+        server = self.servers[server_id]
+        timeout = server.get('connection_timeout', 3)
+        start_time = time.monotonic()
+
+        try:
+            client, _ = await self.rcon_pool.acquire(server_id,
+                                                     server,
+                                                     timeout,
+                                                     fresh=True)
+        except Exception as e:
+            return self._probe_failure(e)
+
+        try:
+            # Test with simple command first
+            version_result = await client.command("version")
+
+            # Only check players if version worked
+            player_count = 0
+            if version_result:
+                try:
+                    players_result = await client.command("ListPlayers")
+                    if players_result and "No Players Connected" not in players_result:
+                        lines = players_result.strip().split('\n')
+                        player_count = len([
+                            line for line in lines
+                            if line.strip() and 'No Players' not in line
+                        ])
+                except Exception:
+                    player_count = 0
+        except asyncio.CancelledError:
+            await self.rcon_pool.discard(server_id, client)
+            raise
+        except Exception as e:
+            await self.rcon_pool.discard(server_id, client)
+            return self._probe_failure(e)
+
+        await self.rcon_pool.release(server_id, server, client)
+        return {
+            'status': 'online',
+            'version': version_result[:50] if version_result else 'Connected',
+            'players': player_count,
+            'error': None,
+            'response_time': f"{time.monotonic() - start_time:.2f}s"
+        }
+
+    @staticmethod
+    def _probe_failure(error):
+        if isinstance(error, asyncio.TimeoutError):
+            error_msg = "Connection timeout"
+        else:
+            error_msg = str(error) or type(error).__name__
+            if "timed out" in error_msg.lower():
+                error_msg = "Connection timeout"
+            elif isinstance(error, ConnectionRefusedError
+                            ) or "connection refused" in error_msg.lower():
+                error_msg = "Connection refused"
+            elif "no route to host" in error_msg.lower():
+                error_msg = "Host unreachable"
+
+        return {
+            'status': 'offline',
+            'version': None,
+            'players': None,
+            'error': error_msg[:100],
+            'response_time': "N/A"
+        }
 
-    async def scan_for_new_players(self):
-        """Scan all servers for new players with timeout protection"""
+    async def probe_all_servers(self, deadline=SERVER_STATUS_DEADLINE):
+        """Probe every configured server concurrently within one deadline"""
+        tasks = {
+            server_id: asyncio.create_task(self.probe_server(server_id))
+            for server_id in self.servers
+        }
+        if not tasks:
+            return {}
+
+        await asyncio.wait(tasks.values(), timeout=deadline)
+
+        results = {}
+        for server_id, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                results[server_id] = self._probe_failure(
+                    asyncio.TimeoutError())
+            elif task.exception() is not None:
+                results[server_id] = self._probe_failure(task.exception())
+            else:
+                results[server_id] = task.result()
+        return results
+
+    def _scan_state(self, server_id):
+        state = self.scan_schedule.get(server_id)
+        if state is None:
+            state = {
+                'next_due': 0.0,
+                'interval': 0.0,
+                'empty_scans': 0,
+                'failures': 0,
+                'last_scan': None
+            }
+            self.scan_schedule[server_id] = state
+        return state
+
+    def _schedule_next_scan(self, server_id, reachable, player_count):
+        """Pick the next scan time from the last result of a server"""
+        state = self._scan_state(server_id)
+        if not reachable:
+            state['failures'] += 1
+            interval = PLAYER_SCAN_INTERVAL_UNREACHABLE * 2**(
+                state['failures'] - 1)
+        elif player_count:
+            state['failures'] = 0
+            state['empty_scans'] = 0
+            interval = PLAYER_SCAN_INTERVAL_POPULATED
+        else:
+            state['failures'] = 0
+            state['empty_scans'] += 1
+            interval = PLAYER_SCAN_INTERVAL_EMPTY * 2**(state['empty_scans'] -
+                                                       1)
+
+        # Spread servers so they do not line up on the same tick
+        interval = min(interval * random.uniform(0.9, 1.1),
+                       PLAYER_SCAN_INTERVAL_MAX)
+        state['interval'] = interval
+        state['next_due'] = time.monotonic() + interval
+        state['last_scan'] = datetime.now()
+
+    def drop_unscanned_servers(self):
+        """Forget who is online on servers that were removed or disabled"""
+        for server_id in set(self.online_players) | self.presence.server_ids():
+            server = self.servers.get(server_id)
+            if server is None or not server.get('enabled', True):
+                self.online_players.pop(server_id, None)
+                self.presence.drop_server(server_id)
+
+    def due_scan_servers(self):
+        """Enabled servers whose next adaptive scan is due"""
+        now = time.monotonic()
+        for server_id in list(self.scan_schedule):
+            if server_id not in self.servers:
+                del self.scan_schedule[server_id]
+        self.drop_unscanned_servers()
+
+        return [
+            server_id for server_id, server_config in self.servers.items()
+            if server_config.get('enabled', True)
+            and self._scan_state(server_id)['next_due'] <= now
+        ]
+
+    async def scan_for_new_players(self, server_ids=None):
+        """Scan servers for new players concurrently, returns {server_id: player count or None}"""
         if not self.servers:
             logger.debug("No servers configured for player scanning")
-            return
-
-        # Limit concurrent server scans to prevent blocking
-        for server_id, server_config in self.servers.items():
-            if not server_config.get('enabled', True):
-                continue
-
+            return {}
+
+        if server_ids is None:
+            server_ids = list(self.servers)
+        enabled_servers = [(server_id, self.servers[server_id])
+                           for server_id in server_ids
+                           if server_id in self.servers
+                           and self.servers[server_id].get('enabled', True)]
+        if not enabled_servers:
+            return {}
+
+        # Never run two scans of the same servers side by side
+        async with self._scan_lock:
+            return await self._scan_servers(enabled_servers)
+
+    async def _scan_servers(self, enabled_servers):
+        # Limit concurrent server scans to keep RCON load bounded
+        semaphore = asyncio.Semaphore(PLAYER_SCAN_CONCURRENCY)
+        results = {server_id: None for server_id, _ in enabled_servers}
+
+        async def scan_server(server_id, server_config):
+            server_name = server_config.get('name', server_id)
+            changes = 0
             try:
-                # Use asyncio.wait_for to prevent blocking operations
-                result = await asyncio.wait_for(
-                    self.execute_rcon_command("ListPlayers", server_id),
-                    timeout=5.0  # Short timeout to prevent blocking
-                )
-
-                if result and "No Players Connected" not in str(result):
-                    await self._process_player_scan(result, server_id,
-                                                    server_config['name'])
-
+                async with semaphore:
+                    # Player lines are parsed while the packets stream in
+                    changes = await asyncio.wait_for(
+                        self._process_player_scan(
+                            self.stream_rcon_lines(
+                                "ListPlayers",
+                                server_id,
+                                priority=RCON_PRIORITY_BACKGROUND),
+                            server_id, server_name),
+                        timeout=PLAYER_SCAN_SERVER_TIMEOUT)
+                results[server_id] = self.last_player_count.get(server_id, 0)
             except asyncio.TimeoutError:
-                logger.debug(
-                    f"Timeout scanning {server_config.get('name', server_id)}")
-                continue
+                logger.debug(f"Timeout scanning {server_name}")
             except Exception as e:
-                logger.debug(
-                    f"Could not scan {server_config.get('name', server_id)}: {e}"
-                )
+                logger.debug(f"Could not scan {server_name}: {e}")
+            self._schedule_next_scan(server_id, results[server_id]
+                                     is not None, results[server_id])
+            return changes
+
+        tasks = [
+            asyncio.create_task(scan_server(server_id, server_config))
+            for server_id, server_config in enabled_servers
+        ]
+
+        # Each server is processed as soon as its player list arrives
+        changes = 0
+        try:
+            for next_result in asyncio.as_completed(
+                    tasks, timeout=PLAYER_SCAN_DEADLINE):
+                changes += await next_result
+        except asyncio.TimeoutError:
+            pending = sum(1 for task in tasks if not task.done())
+            logger.warning(
+                f"⏱️ Player scan deadline reached - {pending} server(s) skipped"
+            )
+        finally:
+            for (server_id, _), task in zip(enabled_servers, tasks):
+                if not task.done():
+                    task.cancel()
+                    self._schedule_next_scan(server_id, False, None)
+
+        return results
+
+    async def _process_player_scan(self, lines, server_id, server_name):
+        """Diff streamed ListPlayers lines against the last scan, returns the number of mapping changes"""
+        previous = self.online_players.get(server_id)
+        known = previous or {}
+        online = {}  # eos_id -> player_name
+        changes = 0
+
+        async for line in lines:
+            match = PLAYER_LINE_PATTERN.match(line.strip())
+            if not match:
+                # Blank lines and "No Players Connected"
                 continue
 
-    async def _process_player_scan(self, result, server_id, server_name):
-        """Process player scan results"""
-        try:
-            new_players = 0
-            updated_players = 0
-            lines = result.strip().split('\n')
-            current_players = []
-
-            # Parse current online players
-            if "No Players Connected" not in result:
-                for line in lines:
-                    if line.strip() and 'No Players Connected' not in line:
-                        player_name = None
-                        eos_id = None
-
-                        match = re.match(r'(\d+)\.\s+([^,]+),\s+(\w+)', line)
-                        if match:
-                            if player_name:
-                                current_players.append(player_name)
-
-            # Update tracking
-            last_players = self.last_player_list.get(server_id, [])
-            self.last_player_list[server_id] = current_players
-            self.last_player_count[server_id] = len(current_players)
-
-            # Process EOS mapping updates
-            for line in lines:
-                if line.strip() and 'No Players Connected' not in line:
-                    player_name = None
-                    eos_id = None
-
-                    match = re.match(r'(\d+)\.\s+([^,]+),\s+(\w+)', line)
-                    if match:
-                        player_name = match.group(2).strip()
-                        eos_id = match.group(3).strip()
-
-                    if not player_name or not eos_id:
-                        continue
+            player_name = match.group(2).strip()
+            eos_id = match.group(3).strip()
+            player_name = re.sub(r'^\d+\.\s*', '', player_name).strip()
 
-                    player_name = re.sub(r'^\d+\.\s*', '', player_name).strip()
+            if not player_name or len(eos_id) != 32 or not eos_id.isalnum():
+                continue
 
-                    if len(eos_id) != 32 or not eos_id.isalnum():
-                        continue
+            online[eos_id] = player_name
+            if known.get(eos_id) == player_name:
+                # Still online under the same name - nothing to update
+                continue
+            self.presence.mark_online(server_id, eos_id, player_name)
+            changes += self._update_player_mapping(player_name, eos_id)
+
+        # Only a complete list replaces the tracked state
+        for eos_id in known.keys() - online.keys():
+            self.presence.mark_offline(server_id, eos_id)
+        self.presence.server_scanned(server_id)
+        self.online_players[server_id] = online
+        self.last_player_count[server_id] = len(online)
+        self.last_player_check = datetime.now()
 
-                    # Update EOS mapping
-                    if player_name in self.eos_mapping:
-                        current_eos = self.eos_mapping[player_name]
-                        if current_eos != eos_id:
-                            self.eos_mapping[player_name] = eos_id
-                            updated_players += 1
-                    else:
-                        self.eos_mapping[player_name] = eos_id
-                        new_players += 1
-                        if player_name not in self.rewards_data:
-                            self.rewards_data[player_name] = []
-
-            # Save data if changes
-            if new_players + updated_players > 0:
-                await self.save_data()
-                logger.info(
-                    f"✅ EOS Mapping: {new_players} new + {updated_players} updated"
-                )
+        # The first scan of a server only seeds the state
+        if previous is not None:
+            joined = [
+                online[eos_id] for eos_id in online.keys() - previous.keys()
+            ]
+            left = [
+                previous[eos_id]
+                for eos_id in previous.keys() - online.keys()
+            ]
+            if joined or left:
+                self._announce_player_events(server_name, joined, left)
+
+        if changes > 0:
+            logger.info(
+                f"✅ EOS Mapping ({server_name}): {changes} new/updated")
+        return changes
+
+    def _update_player_mapping(self, player_name, eos_id):
+        """Store a scanned player's EOS ID, returns 1 if the mapping changed"""
+        current_eos = self.eos_mapping.get(player_name)
+        if current_eos == eos_id:
+            return 0
+
+        self.set_player_eos(player_name, eos_id)
+        if current_eos is None and player_name not in self.rewards_data:
+            self.rewards_data[player_name] = LevelBitset()
+        return 1
+
+    def set_player_eos(self, player_name, eos_id):
+        """Single place that changes eos_mapping - keeps the player indexes in sync"""
+        old_eos = self.eos_mapping.get(player_name)
+        self.eos_mapping[player_name] = eos_id
+        self.statistics.player_mapped(player_name, old_eos, eos_id)
+        self.write_behind.mark('players', player_name)
+        self.player_search.add(player_name, eos_id)
+        self.mapping_index.set_eos(player_name, old_eos, eos_id)
+
+        # Discord links carry the EOS ID of the player as well
+        if old_eos != eos_id:
+            for discord_id in self.mapping_index.discords_for_player(
+                    player_name):
+                link = self.discord_mapping.get(discord_id)
+                if link and link.get('eos_id') != eos_id:
+                    self._set_link(discord_id, {**link, 'eos_id': eos_id})
+
+    def link_discord(self, discord_id, player_name):
+        """Single place that changes discord_mapping - keeps the reverse indexes in sync"""
+        link = {
+            "eos_id": self.eos_mapping[player_name],
+            "player_name": player_name,
+            "original_input": player_name,
+            "linked_at": datetime.now().isoformat()
+        }
+        self._journal({'op': 'link', 'discord_id': discord_id, 'link': link})
+        self._set_link(discord_id, link)
+        return link
+
+    def _set_link(self, discord_id, link):
+        old_link = self.discord_mapping.get(discord_id)
+        self.discord_mapping[discord_id] = link
+        self.statistics.link_added(old_link is None)
+        self.mapping_index.link(discord_id, old_link, link)
+        self.write_behind.mark('links', discord_id)
+
+    async def run_store(self, method, *args):
+        """Run a blocking storage call on the disk executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.disk_executor, method, *args)
+
+    def remove_claim(self, player_name, level):
+        self._journal({'op': 'delete', 'player': player_name, 'level': level})
+        self._apply_delete(player_name, level)
+
+    def _apply_claim(self, player_name, level, claimed_at, claim_id=None):
+        levels = self.rewards_data.get(player_name, LevelBitset())
+        if level not in levels:
+            levels = levels.with_level(level)
+            self.rewards_data[player_name] = levels
+            self.statistics.claim_added(player_name, level, len(levels))
+        self.write_behind.mark('claims', (player_name, level), claimed_at)
+        if claim_id is not None:
+            self._drop_pending(claim_id)
+
+    def pending_claim(self, player_name, level):
+        """Outbox transaction of a claim that is still being delivered"""
+        claim_id = self._pending_claims.get((player_name, level))
+        return self.claim_outbox.get(claim_id)
+
+    def begin_claim(self, player_name, level, commands):
+        """Put a claim into the outbox - await journal.commit() before delivering"""
+        claim_id = uuid.uuid4().hex
+        self._journal({
+            'op': 'claim_pending',
+            'claim_id': claim_id,
+            'player': player_name,
+            'level': level,
+            'commands': commands
+        })
+        self.write_behind.mark('outbox', claim_id)
+        txn = self._add_pending(
+            ClaimTransaction(claim_id, player_name, level, commands))
+        txn.hold_off()
+        return txn
+
+    def find_pending_claim(self, claim_id):
+        """Outbox transaction by claim id or a unique prefix of it"""
+        matches = [
+            txn for known_id, txn in self.claim_outbox.items()
+            if known_id.startswith(claim_id)
+        ]
+        return matches[0] if claim_id and len(matches) == 1 else None
+
+    def retry_claim(self, claim_id):
+        """Give a stuck claim a fresh set of attempts, starting right away"""
+        txn = self.claim_outbox[claim_id]
+        txn.attempts = 0
+        txn.next_attempt = 0.0
+        self.write_behind.mark('outbox', claim_id)
+
+    def cancel_claim(self, claim_id):
+        """Drop a claim from the outbox without recording it"""
+        self._journal({'op': 'claim_cancel', 'claim_id': claim_id})
+        self._drop_pending(claim_id)
+
+    def _add_pending(self, txn):
+        existing = self.claim_outbox.get(txn.claim_id)
+        if existing is not None:
+            return existing
+        self.claim_outbox[txn.claim_id] = txn
+        self._pending_claims[(txn.player_name, txn.level)] = txn.claim_id
+        return txn
+
+    def _apply_steps(self, claim_id, steps):
+        txn = self.claim_outbox.get(claim_id)
+        if txn is not None:
+            txn.delivered.update(steps)
+            self.write_behind.mark('outbox', claim_id)
+
+    def _drop_pending(self, claim_id):
+        txn = self.claim_outbox.pop(claim_id, None)
+        if txn is not None:
+            if self._pending_claims.get(
+                (txn.player_name, txn.level)) == claim_id:
+                del self._pending_claims[(txn.player_name, txn.level)]
+            self.write_behind.mark('outbox', claim_id)
+
+    async def deliver_claim(self, txn, priority=RCON_PRIORITY_BACKGROUND):
+        """Send the undelivered commands of an outbox claim, returns True once it is complete"""
+        return (await self.deliver_claims([txn], priority))[0]
+
+    async def deliver_claims(self, txns, priority=RCON_PRIORITY_BACKGROUND):
+        """Send the undelivered commands of one player's outbox claims in one RCON pipeline"""
+        for txn in txns:
+            txn.hold_off()
+        batch = [(txn, step) for txn in txns for step in txn.pending_steps]
+        results = await self.execute_rcon_batch(
+            [txn.commands[step] for txn, step in batch],
+            server_id=self.presence.locate(txns[0].player_name),
+            priority=priority)
+
+        delivered = {txn.claim_id: [] for txn in txns}
+        for (txn, step), result in zip(batch, results):
+            if result is not None:
+                delivered[txn.claim_id].append(step)
+
+        now = datetime.now().isoformat()
+        for txn in txns:
+            steps = delivered[txn.claim_id]
+            # Each delivered command is journaled so a retry never repeats it
+            for step in steps:
+                self._journal({
+                    'op': 'step_done',
+                    'claim_id': txn.claim_id,
+                    'step': step
+                })
+            missing = len(txn.pending_steps) - len(steps)
+            self._apply_steps(txn.claim_id, steps)
+            txn.delivered.update(steps)
+
+            if txn.complete:
+                self._journal({
+                    'op': 'claim',
+                    'player': txn.player_name,
+                    'level': txn.level,
+                    'claim_id': txn.claim_id
+                })
+                self._apply_claim(txn.player_name, txn.level, now,
+                                  txn.claim_id)
+            else:
+                txn.schedule_retry(
+                    f"{missing}/{len(txn.commands)} commands not delivered")
+                self.write_behind.mark('outbox', txn.claim_id)
+                if txn.given_up:
+                    logger.error(
+                        f"📪 Giving up on claim {txn.player_name}/Level {txn.level} after {txn.attempts} attempts - see /claimqueue"
+                    )
+
+        # One fsync for the whole batch
+        try:
+            await self.journal.commit()
+        except Exception as e:
+            # Still recorded in memory and queued for the database
+            logger.error(
+                f"❌ Could not journal claims of {txns[0].player_name}: {e}")
+        return [txn.complete for txn in txns]
+
+    def _apply_delete(self, player_name, level):
+        levels = self.rewards_data.get(player_name, LevelBitset())
+        if level in levels:
+            levels = levels.without_level(level)
+            self.rewards_data[player_name] = levels
+            self.statistics.claim_removed(player_name, level, len(levels))
+        self.write_behind.mark('claims', (player_name, level), None)
+
+    def _apply_journal_event(self, entry):
+        """Replay one journal entry - safe to apply more than once"""
+        op = entry.get('op')
+        if op == 'claim':
+            self._apply_claim(entry['player'], entry['level'], entry.get('at'),
+                              entry.get('claim_id'))
+        elif op == 'claim_pending':
+            if entry['level'] not in self.rewards_data.get(
+                    entry['player'], LevelBitset()):
+                self.write_behind.mark('outbox', entry['claim_id'])
+                self._add_pending(
+                    ClaimTransaction(entry['claim_id'],
+                                     entry['player'],
+                                     entry['level'],
+                                     entry['commands'],
+                                     created_at=entry.get('at')))
+        elif op == 'step_done':
+            self._apply_steps(entry['claim_id'], [entry['step']])
+        elif op == 'claim_cancel':
+            self._drop_pending(entry['claim_id'])
+        elif op == 'delete':
+            self._apply_delete(entry['player'], entry['level'])
+        elif op == 'link':
+            link = entry['link']
+            # The player's EOS ID may have changed after the link was made
+            eos_id = self.eos_mapping.get(link.get('player_name'))
+            if eos_id and link.get('eos_id') != eos_id:
+                link = {**link, 'eos_id': eos_id}
+            self._set_link(entry['discord_id'], link)
+        else:
+            logger.warning(f"⚠️ Unknown journal entry: {op}")
+
+    def _journal(self, event):
+        self.journal.append(event)
+        if self.journal.size >= JOURNAL_COMPACT_THRESHOLD and not self._compacting:
+            task = asyncio.create_task(self.compact_journal())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def compact_journal(self):
+        """Fold the journal into the database and drop the folded entries"""
+        if self._compacting:
+            return
+        self._compacting = True
+        try:
+            await self.journal.commit()
+            folded_seq = self.journal.last_seq
+            self.write_behind.mark('meta', 'journal_seq', str(folded_seq))
+            await self.write_behind.flush()
+            left = await self.run_store(self.journal.compact, folded_seq)
+            logger.debug(
+                f"📜 Journal compacted up to seq {folded_seq} ({left} entries left)")
+        except Exception as e:
+            logger.error(f"❌ Journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    async def _write_changes(self, changes):
+        """Build rows for the dirty keys (on the loop) and write them in one transaction"""
+        rows = {
+            'players': [(player_name, self.eos_mapping.get(player_name))
+                        for player_name in changes.get('players', ())],
+            'claims': [(player_name, level, claimed_at)
+                       for (player_name, level), claimed_at in changes.get(
+                           'claims', {}).items()],
+            'links': [],
+            'meta': list(changes.get('meta', {}).items()),
+            'outbox': [(claim_id, self.claim_outbox[claim_id].to_row()
+                        if claim_id in self.claim_outbox else None)
+                       for claim_id in changes.get('outbox', ())]
+        }
+        for discord_id in changes.get('links', ()):
+            link = self.discord_mapping.get(discord_id)
+            if link is None:
+                rows['links'].append((discord_id, None, None, None))
+            else:
+                rows['links'].append(
+                    (discord_id, link.get('player_name', ''),
+                     link.get('eos_id'), json.dumps(link)))
+        if 'servers' in changes:
+            rows['servers'] = [(server_id, json.dumps(config))
+                               for server_id, config in self.servers.items()]
+
+        await self.run_store(self.store.apply_changes, rows)
+
+    def rebuild_player_indexes(self):
+        """Rebuild all player indexes and statistics after the mappings were replaced"""
+        self.player_search.rebuild(self.eos_mapping)
+        self.mapping_index.rebuild(self.eos_mapping, self.discord_mapping)
+        self.statistics.rebuild(self.rewards_data, self.eos_mapping,
+                                self.discord_mapping)
+
+    def _announce_player_events(self, server_name, joined, left):
+        """Post join/leave events to the configured playerEventsChannel"""
+        logger.info(
+            f"👥 {server_name}: {len(joined)} joined, {len(left)} left")
+
+        if not self.player_events_channel:
+            return
+        try:
+            channel = self.get_channel(int(self.player_events_channel))
+        except (TypeError, ValueError):
+            channel = None
+        if channel is None:
+            return
 
+        event_lines = [
+            f"🟢 **{name}** ist **{server_name}** beigetreten"
+            for name in sorted(joined)
+        ] + [
+            f"🔴 **{name}** hat **{server_name}** verlassen"
+            for name in sorted(left)
+        ]
+        message = "\n".join(event_lines)
+        if len(message) > 2000:
+            message = message[:1990] + "\n..."
+
+        # Never hold up the scan for Discord
+        task = asyncio.create_task(self._send_player_events(channel, message))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _send_player_events(self, channel, message):
+        try:
+            await channel.send(message)
         except Exception as e:
-            logger.error(f"Error scanning for new players: {e}")
+            logger.warning(f"⚠️ Could not post player events: {e}")
 
-    @tasks.loop(minutes=2)
+    @tasks.loop(seconds=PLAYER_SCAN_TICK)
     async def auto_player_scan_task(self):
-        """Automatically scan for new players every 2 minutes"""
+        """Scan the servers whose adaptive scan interval is due"""
         try:
             if not self.servers:
                 return
-            await self.scan_for_new_players()
+            due = self.due_scan_servers()
+            if due:
+                await self.scan_for_new_players(due)
         except Exception as e:
             logger.debug(f"Auto player scan error: {e}")
 
@@ -1006,6 +3850,39 @@ class ARKBot(commands.Bot):
         await self.wait_until_ready()
         logger.info("🔄 Auto player scan task starting...")
 
+    @tasks.loop(seconds=CLAIM_RETRY_TICK)
+    async def claim_outbox_task(self):
+        """Retry the undelivered commands of pending claims"""
+        try:
+            now = time.time()
+            due = [
+                txn for txn in self.claim_outbox.values()
+                if txn.next_attempt <= now and not txn.given_up
+            ]
+            for txn in due:
+                async with self.claim_locks.hold(txn.player_name):
+                    # Finished, cancelled or rescheduled by /claim while we
+                    # waited for the player's lock
+                    if (self.claim_outbox.get(txn.claim_id) is not txn
+                            or txn.given_up
+                            or txn.next_attempt > time.time()):
+                        continue
+                    complete = await self.deliver_claim(txn)
+                if complete:
+                    logger.info(
+                        f"📬 Claim {txn.player_name}/Level {txn.level} delivered after {txn.attempts + 1} attempts"
+                    )
+                elif not txn.given_up:
+                    logger.warning(
+                        f"📪 Claim {txn.player_name}/Level {txn.level} still pending ({txn.last_error}) - next try in {txn.next_attempt - time.time():.0f}s"
+                    )
+        except Exception as e:
+            logger.error(f"Claim outbox error: {e}")
+
+    @claim_outbox_task.before_loop
+    async def before_claim_outbox(self):
+        await self.wait_until_ready()
+
     @tasks.loop(minutes=15)
     async def autosave_task(self):
         """Autosave task"""
@@ -1033,6 +3910,13 @@ class ARKBot(commands.Bot):
             if latency > 1000:  # High latency warning
                 logger.warning(f"⚠️ High Discord latency: {latency:.1f}ms")
 
+            for executor in (self.rcon_executor, self.disk_executor):
+                metrics = executor.metrics()
+                if metrics['saturation'] >= 1 and metrics['queued'] > 0:
+                    logger.warning(
+                        f"⚠️ Executor {executor.name} saturated: {metrics['active']}/{metrics['workers']} busy, {metrics['queued']} queued"
+                    )
+
             valid_servers = len(
                 [s for s in self.servers.values() if s.get('enabled', True)])
             logger.info(
@@ -1102,6 +3986,23 @@ class ARKBot(commands.Bot):
             f"🤖 Bot fully initialized - {len(self.guilds)} Discord servers, {len(self.servers)} ARK servers"
         )
 
+    async def close(self):
+        """Close pooled RCON sessions and the database before shutting down"""
+        for scheduler in self.rcon_schedulers.values():
+            scheduler.close()
+        await self.rcon_pool.close_all()
+        self.rcon_executor.shutdown(wait=False)
+        try:
+            await self.compact_journal()
+            await self.write_behind.close()
+            await self.run_store(self.store.close)
+        except Exception as e:
+            logger.error(f"Error closing database: {e}")
+        # Let queued disk writes drain without blocking the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.disk_executor.shutdown, True)
+        await super().close()
+
 
 bot = ARKBot()
 
@@ -1111,41 +4012,24 @@ async def player_autocomplete(interaction: discord.Interaction,
                               current: str) -> list[app_commands.Choice[str]]:
     """Autocomplete for player names"""
     try:
-        online_players = bot.last_player_list.get(bot.default_server, [])
-        all_players = list(bot.eos_mapping.keys())
-        offline_players = [p for p in all_players if p not in online_players]
-
-        if current:
-            current_lower = current.lower()
-            online_players = [
-                p for p in online_players if current_lower in p.lower()
-            ]
-            offline_players = [
-                p for p in offline_players if current_lower in p.lower()
-            ]
-
+        online = bot.presence.online_players()
         choices = []
 
-        # Online players first
-        for player in online_players[:10]:
-            eos_id = bot.eos_mapping.get(player, "")
-            eos_valid = len(eos_id) == 32 and eos_id.isalnum()
-            status = "🔗" if eos_valid else "⚠️"
-
-            choices.append(
-                app_commands.Choice(name=f"✅ {player} (Online {status})",
-                                    value=player))
-
-        # Offline players
-        remaining_slots = 25 - len(choices)
-        for player in offline_players[:remaining_slots]:
-            eos_id = bot.eos_mapping.get(player, "")
-            eos_valid = len(eos_id) == 32 and eos_id.isalnum()
-            status = "🔗" if eos_valid else "⚠️"
-
-            choices.append(
-                app_commands.Choice(name=f"🔴 {player} (Offline {status})",
-                                    value=player))
+        # Online players first (ranked by the index)
+        for player in bot.player_search.search(current, 25, preferred=online):
+            status = "🔗" if bot.player_search.eos_valid(player) else "⚠️"
+            server_id = online.get(player)
+            if server_id is not None:
+                server_name = bot.servers.get(server_id,
+                                              {}).get('name', server_id)
+                choices.append(
+                    app_commands.Choice(
+                        name=f"✅ {player} (Online: {server_name} {status})",
+                        value=player))
+            else:
+                choices.append(
+                    app_commands.Choice(name=f"🔴 {player} (Offline {status})",
+                                        value=player))
 
         return choices
 
@@ -1228,6 +4112,31 @@ async def setdefaultserver_cmd(interaction: discord.Interaction,
     await set_default_server(interaction, server_id)
 
 
+@bot.tree.command(
+    name='scannow',
+    description='🔄 Scan servers for players right now (Admin only)')
+@app_commands.describe(server_id="Server ID to scan (default: all servers)")
+@app_commands.autocomplete(server_id=server_autocomplete)
+async def scannow_cmd(interaction: discord.Interaction, server_id: str = None):
+    await scan_now(interaction, server_id)
+
+
+@bot.tree.command(
+    name='claimqueue',
+    description='📬 Show, retry or cancel undelivered claims (Admin only)')
+@app_commands.describe(action="What to do",
+                       claim_id="Claim ID (or its first characters)")
+@app_commands.choices(action=[
+    app_commands.Choice(name="Anzeigen", value="list"),
+    app_commands.Choice(name="Erneut senden", value="retry"),
+    app_commands.Choice(name="Abbrechen", value="cancel")
+])
+async def claimqueue_cmd(interaction: discord.Interaction,
+                         action: str = "list",
+                         claim_id: str = None):
+    await claim_queue(interaction, action, claim_id)
+
+
 # 2. USER COMMANDS (Core functionality)
 @bot.tree.command(name='link',
                   description='🔗 Link Discord account to ARK player')
@@ -1250,6 +4159,13 @@ async def claim_cmd(interaction: discord.Interaction, level: int):
     await claim_reward(interaction, level)
 
 
+@bot.tree.command(name='claimall',
+                  description='🎁 Claim all rewards up to your level')
+@app_commands.describe(level="Your current level")
+async def claimall_cmd(interaction: discord.Interaction, level: int):
+    await claim_all_rewards(interaction, level)
+
+
 @bot.tree.command(name='deletereward',
                   description='🗑️ Delete claimed reward for a specific level')
 @app_commands.describe(level="Level whose reward should be removed")
@@ -1544,74 +4460,23 @@ async def check_server_status(interaction: discord.Interaction):
         color=0x0099ff)
     await interaction.followup.send(embed=embed)
 
-    # Check each server with timeout protection
-    results = {}
+    # Probe all servers concurrently - bounded by the slowest server
+    results = await bot.probe_all_servers()
     online_count = 0
     offline_count = 0
 
-    for server_id, server_config in bot.servers.items():
-        try:
-            # Use shorter timeout to prevent blocking
-            timeout = server_config.get('connection_timeout', 3)
-
-            # Test connection with timeout
-            with MCRcon(server_config['host'],
-                        server_config['password'],
-                        port=server_config['port'],
-                        timeout=timeout) as mcr:
-
-                # Test with simple command first
-                version_result = mcr.command("version")
-
-                # Only check players if version worked
-                player_count = 0
-                if version_result:
-                    try:
-                        players_result = mcr.command("ListPlayers")
-                        if players_result and "No Players Connected" not in players_result:
-                            lines = players_result.strip().split('\n')
-                            player_count = len([
-                                line for line in lines
-                                if line.strip() and 'No Players' not in line
-                            ])
-                    except:
-                        player_count = 0
-
-                results[server_id] = {
-                    'status': 'online',
-                    'version':
-                    version_result[:50] if version_result else 'Connected',
-                    'players': player_count,
-                    'error': None,
-                    'response_time': f"{timeout}s"
-                }
-                online_count += 1
-
-                # Update server status
-                bot.servers[server_id]['status'] = 'ONLINE'
-                bot.servers[server_id]['connection_tested'] = True
-
-        except Exception as e:
-            error_msg = str(e)
-            if "timed out" in error_msg.lower():
-                error_msg = "Connection timeout"
-            elif "connection refused" in error_msg.lower():
-                error_msg = "Connection refused"
-            elif "no route to host" in error_msg.lower():
-                error_msg = "Host unreachable"
-
-            results[server_id] = {
-                'status': 'offline',
-                'version': None,
-                'players': None,
-                'error': error_msg[:100],
-                'response_time': "N/A"
-            }
+    for server_id, result in results.items():
+        if server_id not in bot.servers:
+            continue
+        if result['status'] == 'online':
+            online_count += 1
+            bot.servers[server_id]['status'] = 'ONLINE'
+            bot.servers[server_id]['connection_tested'] = True
+        else:
             offline_count += 1
-
-            # Update server status
             bot.servers[server_id]['status'] = 'OFFLINE'
             bot.servers[server_id]['connection_tested'] = False
+    bot.write_behind.mark('servers', '*')
 
     # Create status report
     status_embed = discord.Embed(title="📊 Server Status Report",
@@ -1626,13 +4491,15 @@ async def check_server_status(interaction: discord.Interaction):
 
     # Detailed server status
     for server_id, result in results.items():
-        server_config = bot.servers[server_id]
+        server_config = bot.servers.get(server_id)
+        if server_config is None:
+            continue
         server_name = server_config.get('name', server_id)
 
         if result['status'] == 'online':
             status_icon = "✅"
             status_text = "ONLINE"
-            details = f"🎮 **Spieler:** {result['players']}\n📋 **Version:** {result['version']}"
+            details = f"🎮 **Spieler:** {result['players']}\n📋 **Version:** {result['version']}\n⏱️ **Antwortzeit:** {result['response_time']}"
         else:
             status_icon = "❌"
             status_text = "OFFLINE"
@@ -1663,7 +4530,7 @@ async def set_default_server(interaction: discord.Interaction, server_id: str):
 
     old_default = bot.default_server
     bot.default_server = server_id
-    await bot.save_data()
+    bot.write_behind.mark('meta', 'default_server', server_id)
 
     server_name = bot.servers[server_id]['name']
     embed = discord.Embed(title="⭐ Standard-Server gesetzt", color=0x00ff00)
@@ -1676,6 +4543,95 @@ async def set_default_server(interaction: discord.Interaction, server_id: str):
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
+async def scan_now(interaction: discord.Interaction, server_id: str = None):
+    """Run a player scan immediately, outside the adaptive schedule"""
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message(
+            "❌ Du benötigst Administrator-Rechte für diesen Befehl!",
+            ephemeral=True)
+        return
+
+    if server_id and server_id not in bot.servers:
+        await interaction.response.send_message(
+            f"❌ Server `{server_id}` nicht gefunden!", ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True)
+
+    results = await bot.scan_for_new_players(
+        [server_id] if server_id else None)
+    if not results:
+        await interaction.followup.send(
+            "❌ Keine aktivierten Server zum Scannen gefunden!", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="🔄 Spieler-Scan abgeschlossen",
+                          color=0x00ff00)
+    for scanned_id, player_count in results.items():
+        server_name = bot.servers.get(scanned_id, {}).get('name', scanned_id)
+        state = bot.scan_schedule.get(scanned_id, {})
+        next_scan = f"{state.get('interval', 0):.0f}s"
+        if player_count is None:
+            value = f"❌ **Nicht erreichbar**\n⏭️ **Nächster Scan in:** {next_scan}"
+        else:
+            value = f"🎮 **Spieler:** {player_count}\n⏭️ **Nächster Scan in:** {next_scan}"
+        embed.add_field(name=f"🗺️ {server_name}", value=value, inline=True)
+
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def claim_queue(interaction: discord.Interaction,
+                      action: str = "list",
+                      claim_id: str = None):
+    """Show the claim outbox, or retry/cancel one of its claims"""
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message(
+            "❌ Du benötigst Administrator-Rechte für diesen Befehl!",
+            ephemeral=True)
+        return
+
+    if action == "list":
+        embed = discord.Embed(title="📬 Claim Outbox", color=0x0099ff)
+        if not bot.claim_outbox:
+            embed.description = "✅ Keine ausstehenden Claims"
+        for txn in list(bot.claim_outbox.values())[:25]:
+            state = "❌ Aufgegeben" if txn.given_up else "⏳ Ausstehend"
+            embed.add_field(
+                name=f"{txn.player_name} - Level {txn.level}",
+                value=
+                f"{state}\n🆔 `{txn.claim_id[:8]}`\n📦 {len(txn.delivered)}/{len(txn.commands)} zugestellt\n🔁 Versuche: {txn.attempts}\n⚠️ {txn.last_error or '-'}",
+                inline=True)
+        if len(bot.claim_outbox) > 25:
+            embed.set_footer(
+                text=f"... und {len(bot.claim_outbox) - 25} weitere")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+
+    txn = bot.find_pending_claim(claim_id or "")
+    if txn is None:
+        await interaction.response.send_message(
+            f"❌ Claim `{claim_id}` nicht gefunden oder nicht eindeutig!",
+            ephemeral=True)
+        return
+
+    async with bot.claim_locks.hold(txn.player_name):
+        if txn.claim_id not in bot.claim_outbox:
+            await interaction.response.send_message(
+                "✅ Der Claim wurde inzwischen abgeschlossen!", ephemeral=True)
+            return
+        if action == "retry":
+            bot.retry_claim(txn.claim_id)
+            message = f"🔁 Claim `{txn.claim_id[:8]}` ({txn.player_name}, Level {txn.level}) wird erneut zugestellt."
+        else:
+            bot.cancel_claim(txn.claim_id)
+            message = f"🗑️ Claim `{txn.claim_id[:8]}` ({txn.player_name}, Level {txn.level}) abgebrochen - das Level kann erneut beansprucht werden."
+
+    logger.info(
+        f"📬 {interaction.user} {action} claim {txn.claim_id} ({txn.player_name}/Level {txn.level})"
+    )
+    await interaction.response.send_message(message, ephemeral=True)
+
+
 # User command implementations
 async def link_account(interaction: discord.Interaction, playername: str):
     """Link Discord account to ARK player"""
@@ -1687,14 +4643,7 @@ async def link_account(interaction: discord.Interaction, playername: str):
             ephemeral=True)
         return
 
-    bot.discord_mapping[user_id] = {
-        "eos_id": bot.eos_mapping[playername],
-        "player_name": playername,
-        "original_input": playername,
-        "linked_at": datetime.now().isoformat()
-    }
-
-    await bot.save_data()
+    bot.link_discord(user_id, playername)
     await interaction.response.send_message(
         f"✅ Erfolgreich verknüpft mit **{playername}**!")
 
@@ -1710,7 +4659,7 @@ async def show_status(interaction: discord.Interaction):
 
     player_name = bot.discord_mapping[user_id]['player_name']
     eos_id = bot.discord_mapping[user_id]['eos_id']
-    rewards = bot.rewards_data.get(player_name, [])
+    rewards = bot.rewards_data.get(player_name, LevelBitset())
 
     embed = discord.Embed(title="📊 Dein Status", color=0x0099ff)
 
@@ -1724,7 +4673,7 @@ async def show_status(interaction: discord.Interaction):
                     inline=True)
 
     if rewards:
-        rewards_text = ", ".join(map(str, sorted(rewards)))
+        rewards_text = ", ".join(map(str, rewards))
         embed.add_field(name="🏆 Erhaltene Belohnungen",
                         value=rewards_text,
                         inline=False)
@@ -1733,9 +4682,10 @@ async def show_status(interaction: discord.Interaction):
                         value="Noch keine Belohnungen erhalten",
                         inline=False)
 
-    available_levels = list(bot.config.get('levels', {}).keys())
+    unclaimed = rewards.missing(bot.claimable_mask)
     embed.add_field(name="🎁 Verfügbare Level",
-                    value=", ".join(available_levels),
+                    value=", ".join(map(str, unclaimed))
+                    if unclaimed else "Alle Belohnungen erhalten 🎉",
                     inline=False)
 
     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -1753,7 +4703,7 @@ async def claim_reward(interaction: discord.Interaction, level: int):
     player_name = bot.discord_mapping[user_id]['player_name']
 
     if player_name not in bot.rewards_data:
-        bot.rewards_data[player_name] = []
+        bot.rewards_data[player_name] = LevelBitset()
 
     if level in bot.rewards_data[player_name]:
         await interaction.response.send_message(
@@ -1761,56 +4711,68 @@ async def claim_reward(interaction: discord.Interaction, level: int):
             ephemeral=True)
         return
 
-    if str(level) not in bot.config.get('levels', {}):
+    if level not in bot.reward_plans:
         await interaction.response.send_message(
             f"❌ Keine Belohnung für Level {level} konfiguriert!",
             ephemeral=True)
         return
 
+    pending = bot.pending_claim(player_name, level)
+    if pending and pending.given_up:
+        await interaction.response.send_message(
+            f"❌ Die Zustellung für Level {level} ist fehlgeschlagen. Bitte melde dich bei einem Admin.",
+            ephemeral=True)
+        return
+    if pending:
+        await interaction.response.send_message(
+            f"⏳ Die Belohnung für Level {level} wird bereits zugestellt!",
+            ephemeral=True)
+        return
+
     await interaction.response.defer()
 
     try:
-        eos_id = bot.eos_mapping.get(player_name)
-        if not eos_id or len(eos_id) != 32:
-            await interaction.followup.send(
-                "❌ Ungültige EOS ID. Bitte melde dich bei einem Admin.")
-            return
+        # Check, deliver and record as one step per player - a second
+        # /claim or /eositem for the same player waits here
+        async with bot.claim_locks.hold(player_name):
+            if level in bot.rewards_data.get(player_name, LevelBitset()):
+                await interaction.followup.send(
+                    f"❌ Du hast bereits die Belohnung für Level {level} erhalten!"
+                )
+                return
+            pending = bot.pending_claim(player_name, level)
+            if pending and pending.given_up:
+                await interaction.followup.send(
+                    f"❌ Die Zustellung für Level {level} ist fehlgeschlagen. Bitte melde dich bei einem Admin."
+                )
+                return
+            if pending:
+                await interaction.followup.send(
+                    f"⏳ Die Belohnung für Level {level} wird bereits zugestellt!"
+                )
+                return
 
-        commands = bot.config['levels'][str(level)]
-        success_count = 0
-
-        for reward in commands:
-            original_cmd = reward['cmd']
-
-            if original_cmd.startswith('GiveItemNum'):
-                parts = original_cmd.split()
-                if len(parts) >= 3:
-                    item_id = parts[1]
-                    amount = parts[2]
-                    quality = parts[3] if len(parts) > 3 else "0"
-                    admin_cmd = f'GiveItemToEOSID {eos_id} {item_id} {amount} {quality} 0 0 0 0 0 0'
-            elif original_cmd.startswith('GiveItem'):
-                blueprint_match = re.search(r'"Blueprint\'([^\']+)\'"',
-                                            original_cmd)
-                parts = original_cmd.split()
-                if blueprint_match:
-                    blueprint_path = blueprint_match.group(1)
-                    amount = parts[-3] if len(parts) >= 4 else "1"
-                    quality = parts[-2] if len(parts) >= 4 else "0"
-                    admin_cmd = f'GiveItemToEOSID {eos_id} "Blueprint\'{blueprint_path}\'" {amount} {quality} 0 0 0 0 0 0'
-                else:
-                    admin_cmd = original_cmd.replace('{player}', player_name)
-            else:
-                admin_cmd = original_cmd.replace('{player}', player_name)
+            eos_id = bot.eos_mapping.get(player_name)
+            if not eos_id or len(eos_id) != 32:
+                await interaction.followup.send(
+                    "❌ Ungültige EOS ID. Bitte melde dich bei einem Admin.")
+                return
 
-            result = await bot.execute_rcon_command(admin_cmd)
-            if result is not None:
-                success_count += 1
+            admin_cmds = bot.reward_plans[level].render(player_name, eos_id)
+
+            # The pending claim is on disk before anything is handed out
+            txn = bot.begin_claim(player_name, level, admin_cmds)
+            try:
+                await bot.journal.commit()
+            except Exception:
+                bot.cancel_claim(txn.claim_id)
+                raise
 
-        if success_count == len(commands):
-            bot.rewards_data[player_name].append(level)
-            await bot.save_data()
+            # Deliver the whole reward tier in one pipelined RCON round-trip
+            complete = await bot.deliver_claim(
+                txn, priority=RCON_PRIORITY_INTERACTIVE)
 
+        if complete:
             embed = discord.Embed(
                 title="🎁 Level Belohnung erhalten!",
                 description=
@@ -1823,9 +4785,12 @@ async def claim_reward(interaction: discord.Interaction, level: int):
             await interaction.followup.send(embed=embed)
         else:
             embed = discord.Embed(
-                title="❌ Fehler beim Beanspruchen der Belohnung!",
-                description="Einige Belohnungen konnten nicht gegeben werden.",
-                color=0xff0000)
+                title="⏳ Belohnung wird nachgeliefert",
+                description=
+                f"{len(txn.delivered)}/{len(txn.commands)} Belohnungen wurden zugestellt. Der Rest wird automatisch erneut gesendet.",
+                color=0xff9900)
+            embed.add_field(name="🎮 Spieler", value=player_name, inline=True)
+            embed.add_field(name="🏆 Level", value=str(level), inline=True)
             await interaction.followup.send(embed=embed)
 
     except Exception as e:
@@ -1833,6 +4798,84 @@ async def claim_reward(interaction: discord.Interaction, level: int):
             f"❌ Fehler beim Beanspruchen der Belohnung: {str(e)}")
 
 
+async def claim_all_rewards(interaction: discord.Interaction, level: int):
+    """Claim every unclaimed reward up to the given level at once"""
+    user_id = str(interaction.user.id)
+    if user_id not in bot.discord_mapping:
+        await interaction.response.send_message(
+            "❌ Du musst zuerst deinen Discord Account verknüpfen! Nutze `/link <spielername>`",
+            ephemeral=True)
+        return
+
+    player_name = bot.discord_mapping[user_id]['player_name']
+
+    await interaction.response.defer()
+
+    try:
+        async with bot.claim_locks.hold(player_name):
+            eos_id = bot.eos_mapping.get(player_name)
+            if not eos_id or len(eos_id) != 32:
+                await interaction.followup.send(
+                    "❌ Ungültige EOS ID. Bitte melde dich bei einem Admin.")
+                return
+
+            claimed = bot.rewards_data.get(player_name, LevelBitset())
+            levels = [
+                reward_level
+                for reward_level in claimed.missing(bot.claimable_mask)
+                if reward_level <= level
+                and not bot.pending_claim(player_name, reward_level)
+            ]
+            if not levels:
+                await interaction.followup.send(
+                    f"✅ Keine offenen Belohnungen bis Level {level}!")
+                return
+
+            # All pending claims go to disk with a single fsync
+            txns = [
+                bot.begin_claim(player_name, reward_level,
+                                bot.reward_plans[reward_level].render(
+                                    player_name, eos_id))
+                for reward_level in levels
+            ]
+            try:
+                await bot.journal.commit()
+            except Exception:
+                for txn in txns:
+                    bot.cancel_claim(txn.claim_id)
+                raise
+
+            # Every level's commands in one pipelined RCON round-trip
+            await bot.deliver_claims(txns,
+                                     priority=RCON_PRIORITY_INTERACTIVE)
+
+        lines = []
+        for txn in txns:
+            if txn.complete:
+                lines.append(f"✅ Level {txn.level}")
+            else:
+                lines.append(
+                    f"⏳ Level {txn.level} - {len(txn.delivered)}/{len(txn.commands)} zugestellt, Rest wird nachgeliefert"
+                )
+        complete = sum(1 for txn in txns if txn.complete)
+
+        embed = discord.Embed(
+            title="🎁 Alle Level Belohnungen",
+            description=
+            f"{complete}/{len(txns)} Belohnungen bis Level {level} erhalten!",
+            color=0x00ff00 if complete == len(txns) else 0xff9900)
+        embed.add_field(name="🎮 Spieler", value=player_name, inline=True)
+        embed.add_field(name="🏆 Level",
+                        value="\n".join(lines)[:1024],
+                        inline=False)
+
+        await interaction.followup.send(embed=embed)
+
+    except Exception as e:
+        await interaction.followup.send(
+            f"❌ Fehler beim Beanspruchen der Belohnungen: {str(e)}")
+
+
 async def delete_reward(interaction: discord.Interaction, level: int):
     """Delete a claimed reward"""
     user_id = str(interaction.user.id)
@@ -1851,14 +4894,21 @@ async def delete_reward(interaction: discord.Interaction, level: int):
             ephemeral=True)
         return
 
-    bot.rewards_data[player_name].remove(level)
-    await bot.save_data()
+    await interaction.response.defer()
+
+    # Same per-player lock as /claim - never interleave with a delivery
+    async with bot.claim_locks.hold(player_name):
+        if level not in bot.rewards_data.get(player_name, LevelBitset()):
+            await interaction.followup.send(
+                f"❌ Du hast noch keine Belohnung für Level {level} erhalten!")
+            return
+        bot.remove_claim(player_name, level)
 
     embed = discord.Embed(
         title="🗑️ Belohnung entfernt",
         description=f"Level {level} Belohnung wurde entfernt!",
         color=0xff9900)
-    await interaction.response.send_message(embed=embed)
+    await interaction.followup.send(embed=embed)
 
 
 async def show_all_players(interaction: discord.Interaction):
@@ -1871,59 +4921,70 @@ async def show_all_players(interaction: discord.Interaction):
         await interaction.response.send_message(embed=embed)
         return
 
-    players_with_rewards = []
-    players_without_rewards = []
-
-    for player_name, eos_id in bot.eos_mapping.items():
-        rewards = bot.rewards_data.get(player_name, [])
-        reward_count = len(rewards)
-
-        discord_user = None
-        for disc_id, mapping in bot.discord_mapping.items():
-            if mapping.get('player_name') == player_name:
-                discord_user = f"<@{disc_id}>"
-                break
-
-        player_info = {
+    def player_info(player_name, reward_count):
+        disc_id = bot.mapping_index.discord_for_player(player_name)
+        return {
             'name': player_name,
             'rewards': reward_count,
-            'discord': discord_user or "Nicht verknüpft",
-            'eos_valid': len(eos_id) == 32 and eos_id.isalnum()
+            'discord': f"<@{disc_id}>" if disc_id else "Nicht verknüpft",
+            'eos_valid': bot.player_search.eos_valid(player_name),
+            'online': bot.presence.is_online(player_name)
         }
 
-        if reward_count > 0:
-            players_with_rewards.append(player_info)
-        else:
-            players_without_rewards.append(player_info)
-
-    players_with_rewards.sort(key=lambda x: x['rewards'], reverse=True)
+    stats = bot.statistics.snapshot()
+
+    # Only the listed players are looked at - the indexes keep the order
+    players_with_rewards = [
+        player_info(player_name, count) for player_name, count in
+        itertools.islice((entry for entry in bot.statistics.top_players()
+                          if entry[0] in bot.eos_mapping), 10)
+    ]
+    players_without_rewards = [
+        player_info(player_name, 0) for player_name in itertools.islice(
+            (name for name in bot.player_search.names()
+             if not bot.rewards_data.get(name)), 5)
+    ]
+
+    online = bot.presence.online_players()
+    if online:
+        online_text = ""
+        for player_name, server_id in sorted(online.items())[:15]:
+            server_name = bot.servers.get(server_id,
+                                          {}).get('name', server_id)
+            online_text += f"🟢 **{player_name}** - {server_name}\n"
+        if len(online) > 15:
+            online_text += f"... und {len(online) - 15} weitere"
+        embed.add_field(name=f"🟢 Online im Cluster ({len(online)})",
+                        value=online_text,
+                        inline=False)
 
     if players_with_rewards:
         reward_text = ""
-        for player in players_with_rewards[:10]:
+        for player in players_with_rewards:
             status = "✅" if player['eos_valid'] else "❌"
-            reward_text += f"{status} **{player['name']}** - {player['rewards']} Belohnungen - {player['discord']}\n"
+            online_marker = " 🟢" if player['online'] else ""
+            reward_text += f"{status} **{player['name']}**{online_marker} - {player['rewards']} Belohnungen - {player['discord']}\n"
         embed.add_field(name="🏆 Spieler mit Belohnungen",
                         value=reward_text,
                         inline=False)
 
     if players_without_rewards:
         no_reward_text = ""
-        for player in players_without_rewards[:5]:
+        for player in players_without_rewards:
             status = "✅" if player['eos_valid'] else "❌"
-            no_reward_text += f"{status} **{player['name']}** - {player['discord']}\n"
-        if len(players_without_rewards) > 5:
-            no_reward_text += f"... und {len(players_without_rewards) - 5} weitere"
+            online_marker = " 🟢" if player['online'] else ""
+            no_reward_text += f"{status} **{player['name']}**{online_marker} - {player['discord']}\n"
+        without_rewards = stats['total_players'] - stats['active_players']
+        if without_rewards > 5:
+            no_reward_text += f"... und {without_rewards - 5} weitere"
         embed.add_field(name="📋 Spieler ohne Belohnungen",
                         value=no_reward_text,
                         inline=False)
 
-    total_players = len(bot.eos_mapping)
-    total_rewards = sum(len(rewards) for rewards in bot.rewards_data.values())
     embed.add_field(
         name="📊 Statistiken",
         value=
-        f"Gesamt: {total_players} Spieler\nBelohnungen: {total_rewards}\nDiscord Links: {len(bot.discord_mapping)}",
+        f"Gesamt: {stats['total_players']} Spieler\nBelohnungen: {stats['total_rewards_given']}\nDiscord Links: {stats['discord_links']}",
         inline=True)
 
     await interaction.response.send_message(embed=embed)
@@ -1948,11 +5009,7 @@ async def eos_command(interaction: discord.Interaction, playername: str):
     status = "✅ Gültig" if is_valid else "❌ Ungültig"
     embed.add_field(name="✨ Status", value=status, inline=True)
 
-    discord_linked = None
-    for discord_id, mapping in bot.discord_mapping.items():
-        if mapping.get('player_name') == playername:
-            discord_linked = discord_id
-            break
+    discord_linked = bot.mapping_index.discord_for_player(playername)
 
     if discord_linked:
         embed.add_field(name="🔗 Discord Link",
@@ -1963,10 +5020,16 @@ async def eos_command(interaction: discord.Interaction, playername: str):
                         value="Nicht verknüpft",
                         inline=True)
 
-    rewards = bot.rewards_data.get(playername, [])
+    other_names = sorted(bot.mapping_index.names_for_eos(eos_id) - {playername})
+    if other_names:
+        embed.add_field(name="👥 Weitere Namen (gleiche EOS ID)",
+                        value=", ".join(other_names[:10]),
+                        inline=True)
+
+    rewards = bot.rewards_data.get(playername, LevelBitset())
     embed.add_field(
         name="🏆 Erhaltene Belohnungen",
-        value=", ".join(map(str, sorted(rewards))) if rewards else "Keine",
+        value=", ".join(map(str, rewards)) if rewards else "Keine",
         inline=True)
 
     await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -1982,32 +5045,25 @@ async def eos_debug(interaction: discord.Interaction):
     embed = discord.Embed(title="🛠️ EOS Mapping Debug Information",
                           color=0xff9900)
 
-    total_eos = len(bot.eos_mapping)
-    valid_eos = sum(1 for eos in bot.eos_mapping.values()
-                    if len(eos) == 32 and eos.isalnum())
-    invalid_eos = total_eos - valid_eos
-
+    stats = bot.statistics.snapshot()
     embed.add_field(
         name="📊 EOS Mapping Stats",
         value=
-        f"Gesamt: {total_eos}\n✅ Gültig: {valid_eos}\n❌ Ungültig: {invalid_eos}",
+        f"Gesamt: {stats['total_players']}\n✅ Gültig: {stats['valid_eos']}\n❌ Ungültig: {stats['invalid_eos']}",
         inline=True)
 
     embed.add_field(name="🔗 Discord Links",
-                    value=str(len(bot.discord_mapping)),
+                    value=str(stats['discord_links']),
                     inline=True)
 
-    total_rewards = sum(len(rewards) for rewards in bot.rewards_data.values())
     embed.add_field(name="🎁 Total Rewards",
-                    value=str(total_rewards),
+                    value=str(stats['total_rewards_given']),
                     inline=True)
 
-    invalid_players = []
-    for player, eos_id in bot.eos_mapping.items():
-        if len(eos_id) != 32 or not eos_id.isalnum() or eos_id in [
-                "???", "??", "unknown"
-        ]:
-            invalid_players.append(f"**{player}**: `{eos_id}`")
+    invalid_players = [
+        f"**{player}**: `{bot.eos_mapping.get(player)}`"
+        for player in sorted(bot.statistics.invalid_eos)
+    ]
 
     if invalid_players:
         invalid_text = "\n".join(invalid_players[:5])
@@ -2055,7 +5111,9 @@ async def eos_item_command(interaction: discord.Interaction, playername: str,
         force_bp_value = 1 if force_blueprint else 0
         command = f'GiveItemToEOSID {eos_id} "{clean_blueprint}" {quantity} {quality} {force_bp_value} 0 0 0 0 0'
 
-        result = await bot.execute_rcon_command(command)
+        async with bot.claim_locks.hold(playername):
+            result = await bot.execute_rcon_command(
+                command, server_id=bot.presence.locate(playername))
 
         if result is not None:
             embed = discord.Embed(title="✅ EOS Item Command erfolgreich!",
@@ -2125,7 +5183,8 @@ async def ark_global_chat(interaction: discord.Interaction, message: str):
     try:
         formatted_message = f"{discord_name} ({ark_player_name}) [DISCORD]: {message}"
         ark_command = f'scriptcommand hb.cmd type=sendchat message={formatted_message}'
-        result = await bot.execute_rcon_command(ark_command)
+        result = await bot.execute_rcon_command(
+            ark_command, priority=RCON_PRIORITY_INTERACTIVE)
 
         if result is not None:
             embed = discord.Embed(
@@ -2206,6 +5265,8 @@ async def help_command(interaction: discord.Interaction):
 `/serverlist` - Alle konfigurierten Server anzeigen  
 `/serverstatus` - Server-Verbindung prüfen
 `/setdefaultserver` - Standard-Server setzen (Admin)
+`/scannow` - Spieler-Scan sofort starten (Admin)
+`/claimqueue` - Ausstehende Claims anzeigen/abbrechen (Admin)
         """,
                     inline=False)
 
@@ -2215,6 +5276,7 @@ async def help_command(interaction: discord.Interaction):
 `/link` - Discord mit ARK Spieler verknüpfen
 `/status` - Deinen Status und Belohnungen anzeigen
 `/claim` - Level-Belohnung beanspruchen
+`/claimall` - Alle Belohnungen bis zu deinem Level beanspruchen
 `/deletereward` - Belohnung entfernen
 `/players` - Alle Spieler auf dem Server anzeigen
         """,
@@ -2275,8 +5337,15 @@ async def bot_status_command(interaction: discord.Interaction):
     embed.add_field(name="🔧 Default Server",
                     value=bot.default_server or "None",
                     inline=True)
+    stats = bot.statistics.snapshot()
     embed.add_field(name="📊 Players Tracked",
-                    value=str(len(bot.eos_mapping)),
+                    value=str(stats['total_players']),
+                    inline=True)
+    embed.add_field(name="🎁 Rewards Given",
+                    value=str(stats['total_rewards_given']),
+                    inline=True)
+    embed.add_field(name="🔗 Discord Links",
+                    value=str(stats['discord_links']),
                     inline=True)
 
     if bot.servers:
@@ -2292,9 +5361,76 @@ async def bot_status_command(interaction: discord.Interaction):
 
 
 async def bot_monitor_command(interaction: discord.Interaction):
-    """Bot monitor command - placeholder"""
-    await interaction.response.send_message(
-        "🔍 Bot Monitor wird implementiert!", ephemeral=True)
+    """Live bot health monitor with RCON queue statistics"""
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message(
+            "❌ Du benötigst Administrator-Rechte!", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="🔍 Live Bot Health Monitor", color=0x0099ff)
+    embed.add_field(name="📡 Discord Latenz",
+                    value=f"{bot.latency * 1000:.1f}ms",
+                    inline=True)
+    embed.add_field(name="🔄 Auto-Scan",
+                    value="✅ Läuft"
+                    if bot.auto_player_scan_task.is_running() else "❌ Gestoppt",
+                    inline=True)
+
+    for server_id, server_config in bot.servers.items():
+        scheduler = bot.rcon_schedulers.get(server_id)
+        if scheduler:
+            depth = scheduler.queue_depth()
+            queue_text = " / ".join(f"{name}: {count}"
+                                    for name, count in depth.items())
+            in_flight = scheduler.in_flight
+            completed = scheduler.completed
+        else:
+            queue_text = "leer"
+            in_flight = 0
+            completed = 0
+
+        rate_limit = server_config.get('rcon_rate_limit',
+                                       RCON_DEFAULT_RATE_LIMIT)
+        breaker = bot.get_circuit_breaker(server_id)
+        circuit_text = breaker.state
+        if breaker.state == CircuitBreaker.OPEN:
+            circuit_text += f" (Probe in {breaker.retry_in():.0f}s)"
+        embed.add_field(
+            name=f"🗺️ {server_config.get('name', server_id)}",
+            value=
+            f"📥 **Warteschlange:** {queue_text}\n⚙️ **Aktiv:** {in_flight}\n✅ **Erledigt:** {completed}\n🔗 **Offene Sessions:** {bot.rcon_pool.idle_count(server_id)}\n⏱️ **Limit:** {rate_limit}/s\n🔌 **Circuit:** {circuit_text}",
+            inline=False)
+
+    for executor in (bot.rcon_executor, bot.disk_executor):
+        metrics = executor.metrics()
+        embed.add_field(
+            name=f"🧵 Executor `{executor.name}`",
+            value=
+            f"Threads: {metrics['active']}/{metrics['workers']} ({metrics['saturation']:.0%})\nWarteschlange: {metrics['queued']} (Peak {metrics['peak_queued']})\nErledigt: {metrics['completed']}",
+            inline=True)
+
+    embed.add_field(
+        name="♻️ Geteilte Leseanfragen",
+        value=
+        f"Cache-Treffer: {bot.rcon_reads.hits}\nGeteilt (in-flight): {bot.rcon_reads.shared}",
+        inline=False)
+
+    last_flush = bot.write_behind.last_flush
+    embed.add_field(
+        name="💾 Write-Behind",
+        value=
+        f"Ausstehend: {bot.write_behind.pending()}\nFlushes: {bot.write_behind.flushes}\nLetzter Flush: {last_flush.strftime('%H:%M:%S') if last_flush else 'Noch keiner'}",
+        inline=False)
+
+    given_up = sum(1 for txn in bot.claim_outbox.values() if txn.given_up)
+    embed.add_field(
+        name="📬 Claim Outbox",
+        value=
+        f"Ausstehend: {len(bot.claim_outbox) - given_up}\nAufgegeben: {given_up}",
+        inline=False)
+
+    embed.set_footer(text=f"Stand: {datetime.now().strftime('%H:%M:%S')}")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
 async def force_sync_commands(interaction: discord.Interaction):